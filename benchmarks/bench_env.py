@@ -0,0 +1,65 @@
+"""Compare declaring env var keys with per-provider and shared snapshots.
+
+Every provider used to copy ``os.environ`` when it was created. Now the
+plugin takes one snapshot that all of its providers share. This declares
+300 keys in an environment with 5000 variables, which is common in CI and
+Kubernetes pods, and reports the time and memory each approach retains.
+
+Run with ``python benchmarks/bench_env.py``.
+"""
+
+import os
+import time
+import tracemalloc
+
+from carlyleconfig.key import ConfigKey
+from carlyleconfig.plugins import EnvVarPlugin
+from carlyleconfig.plugins.envvar import EnvVarProvider
+
+
+KEYS = 300
+VARIABLES = 5000
+
+
+def per_provider():
+    keys = []
+    for i in range(KEYS):
+        key = ConfigKey()
+        key.providers.append(EnvVarProvider(f"VAR_{i}", environ=os.environ.copy()))
+        keys.append(key)
+    return keys
+
+
+def shared():
+    plugin = EnvVarPlugin()
+    keys = []
+    for i in range(KEYS):
+        key = ConfigKey()
+        plugin.inject_factory_method(key)
+        keys.append(key.from_env_var(f"VAR_{i}"))
+    return keys
+
+
+def measure(declare):
+    tracemalloc.start()
+    start = time.perf_counter()
+    keys = declare()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert all(key.resolve() is not None for key in keys)
+    return elapsed, current
+
+
+def main():
+    for i in range(VARIABLES):
+        os.environ[f"VAR_{i}"] = f"value-{i}"
+    print(f"{KEYS} keys, {len(os.environ)} environment variables")
+    print(f"{'snapshot':>12} {'seconds':>8} {'MiB':>7}")
+    for name, declare in (("per-provider", per_provider), ("shared", shared)):
+        elapsed, retained = measure(declare)
+        print(f"{name:>12} {elapsed:>8.3f} {retained / 2**20:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare the FilePlugin read modes on a large file.
+
+``text`` decodes the whole file into a ``str`` and ``binary`` copies it
+into ``bytes``. ``mmap`` hands the parser a mapping of the file, so no
+copy of the contents is made on the Python heap.
+
+Run with ``python benchmarks/bench_file_read.py``.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+from carlyleconfig.plugins import FilePlugin
+
+
+SIZE = 64 * 1024 * 1024
+
+
+def digest(content):
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+def measure(path, read_mode):
+    plugin = FilePlugin()
+    tracemalloc.start()
+    start = time.perf_counter()
+    plugin.read_file(path, digest, read_mode)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.pem")
+        with open(path, "wb") as f:
+            f.write(b"A" * SIZE)
+        print(f"{'mode':>8} {'seconds':>8} {'peak MiB':>9}")
+        for read_mode in ("text", "binary", "mmap"):
+            elapsed, peak = measure(path, read_mode)
+            print(f"{read_mode:>8} {elapsed:>8.3f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare the generic and the generated config ``__init__``.
+
+Run with ``python benchmarks/bench_init.py``.
+"""
+
+import timeit
+
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plan import build_plan
+from carlyleconfig.register import generate_init, init_factory
+
+
+def build_fields(derive, count):
+    fields = {}
+    for i in range(count):
+        key = derive.field().from_env_var(f"BENCH_VAR_{i}").from_constant(i)
+        key.name = f"field_{i}"
+        fields[key.name] = key
+    return fields
+
+
+def main():
+    derive = ConfigEnvironment()
+    print(f"{'fields':>8} {'generic (us)':>14} {'generated (us)':>16} {'speedup':>8}")
+    for count in (10, 100, 1000):
+        fields = build_fields(derive, count)
+        plan = build_plan(fields)
+        Config = type("Config", (), {})
+        results = {}
+        for label, init in (
+            ("generic", init_factory(fields, plan)),
+            ("generated", generate_init(fields, plan)),
+        ):
+            instance = Config()
+            number = max(10, 10000 // count)
+            best = min(timeit.repeat(lambda: init(instance), number=number, repeat=5))
+            results[label] = best / number * 1e6
+        print(
+            f"{count:>8} {results['generic']:>14.1f} {results['generated']:>16.1f} "
+            f"{results['generic'] / results['generated']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
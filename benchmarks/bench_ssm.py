@@ -0,0 +1,40 @@
+"""Compare sequential and concurrent SSM chunk fetching.
+
+The fake client sleeps for a fixed latency on every ``get_parameters``
+call to stand in for the round-trip to SSM.
+
+Run with ``python benchmarks/bench_ssm.py``.
+"""
+
+import time
+
+from carlyleconfig.plugins import SSMPlugin
+
+
+LATENCY = 0.02
+
+
+class LatencyClient:
+    def get_parameters(self, Names, WithDecryption):
+        time.sleep(LATENCY)
+        return {"Parameters": [{"Name": n, "Value": n} for n in Names]}
+
+
+def fetch(count, workers):
+    plugin = SSMPlugin("/svc/", client=LatencyClient(), max_workers=workers)
+    for i in range(count):
+        plugin.add_name(f"param-{i}")
+    start = time.perf_counter()
+    plugin.value_for_name("param-0")
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'params':>8} {'workers':>8} {'seconds':>8}")
+    for count in (50, 200):
+        for workers in (1, 4, 8):
+            print(f"{count:>8} {workers:>8} {fetch(count, workers):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
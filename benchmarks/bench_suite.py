@@ -0,0 +1,208 @@
+"""Benchmark registration, resolution and instantiation of config classes.
+
+Config classes of 10, 1k and 10k fields are generated with provider
+chains mixing environment variables, constants, a JSON file, SSM and
+Secrets Manager. The AWS clients are fakes that sleep for ``--latency``
+seconds on every call to stand in for the round trip.
+
+For every size this measures:
+
+* ``declare``: creating the ConfigKeys, what importing a settings
+  module costs before the decorator runs
+* ``register``: running ``deriveconfig`` on the class
+* ``first``: the first ``Config()``, with cold plugin caches
+* ``repeat``: a later ``Config()``, which runs the providers again
+  against warm plugin caches
+* ``load``: ``Config.load()``, which reuses the values cached on the
+  keys
+* ``peak_mib``: peak traced memory over all of the above, measured in a
+  separate run so tracing does not skew the timings
+
+Every timing is the best of ``--rounds`` runs, each with a freshly
+generated class and plugins.
+
+Run with ``python benchmarks/bench_suite.py``. Save a baseline with
+``--save baseline.json`` and check a later commit against it with
+``--compare baseline.json``, which exits with status 1 when a timing
+regressed by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from carlyleconfig import deriveconfig
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plugins import SecretsManagerPlugin, SSMPlugin
+
+
+SIZES = (10, 1000, 10000)
+SECRETS = 20
+TIMINGS = ("declare", "register", "first", "repeat", "load")
+
+
+class LatencySSMClient:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def get_parameters(self, Names, WithDecryption):
+        time.sleep(self.latency)
+        return {"Parameters": [{"Name": n, "Value": n} for n in Names]}
+
+
+class LatencySecretsClient:
+    class exceptions:
+        class ResourceNotFoundException(Exception):
+            pass
+
+    def __init__(self, latency, count):
+        self.latency = latency
+        self.secret = json.dumps({f"key_{i}": f"value_{i}" for i in range(count)})
+
+    def get_secret_value(self, SecretId):
+        time.sleep(self.latency)
+        return {"Name": SecretId, "SecretString": self.secret}
+
+    def batch_get_secret_value(self, SecretIdList, **kwargs):
+        time.sleep(self.latency)
+        return {
+            "SecretValues": [
+                {"Name": name, "SecretString": self.secret} for name in SecretIdList
+            ]
+        }
+
+
+def make_environment(count, latency, path):
+    derive = ConfigEnvironment()
+    derive.add_plugin(SSMPlugin("/bench/", client=LatencySSMClient(latency)))
+    derive.add_plugin(SecretsManagerPlugin(client=LatencySecretsClient(latency, count)))
+    env = derive.plugins["EnvVarPlugin"]
+    env.environ = {f"BENCH_{i}": str(i) for i in range(0, count, 5)}
+    with open(path, "w") as f:
+        json.dump({f"key_{i}": i for i in range(count)}, f)
+    return derive
+
+
+def declare(derive, count, path):
+    namespace = {}
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            key = derive.field().from_env_var(f"BENCH_{i}", cast=int)
+        elif kind == 1:
+            key = derive.field().from_env_var(f"BENCH_{i}").from_constant(i)
+        elif kind == 2:
+            key = derive.field().from_json_file(path, f"key_{i}")
+        elif kind == 3:
+            key = derive.field().from_ssm_parameter(f"param_{i}").from_constant(i)
+        else:
+            key = derive.field().from_secrets_manager(
+                f"secret_{i % SECRETS}", key=f"key_{i}"
+            )
+        namespace[f"field_{i}"] = key
+    return namespace
+
+
+def run(count, latency, directory):
+    path = os.path.join(directory, f"bench-{count}.json")
+    derive = make_environment(count, latency, path)
+    results = {}
+
+    start = time.perf_counter()
+    namespace = declare(derive, count, path)
+    results["declare"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Config = deriveconfig(type("Config", (), namespace))
+    results["register"] = time.perf_counter() - start
+
+    for label, create in (
+        ("first", Config),
+        ("repeat", Config),
+        ("load", Config.load),
+    ):
+        start = time.perf_counter()
+        create()
+        results[label] = time.perf_counter() - start
+    return results
+
+
+def peak_memory(count, latency, directory):
+    tracemalloc.start()
+    run(count, latency, directory)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def compare(results, baseline, threshold):
+    regressed = []
+    print(f"{'fields':>8} {'metric':>9} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for size, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(size, {}).get(metric)
+            if not before:
+                continue
+            ratio = value / before
+            flag = " !" if ratio > 1 + threshold else ""
+            print(
+                f"{size:>8} {metric:>9} {before:>10.4f} {value:>10.4f} "
+                f"{ratio:>6.2f}x{flag}"
+            )
+            if flag and metric in TIMINGS:
+                regressed.append((size, metric))
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, SIZES)), help="Field counts to run."
+    )
+    parser.add_argument("--latency", type=float, default=0.001)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare with a saved JSON baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'fields':>8} " + " ".join(f"{t:>9}" for t in TIMINGS) + " peak MiB")
+        for size in (int(s) for s in args.sizes.split(",")):
+            rounds = [run(size, args.latency, directory) for _ in range(args.rounds)]
+            timings = {t: min(r[t] for r in rounds) for t in TIMINGS}
+            timings["peak_mib"] = peak_memory(size, args.latency, directory)
+            results[str(size)] = timings
+            print(
+                f"{size:>8} "
+                + " ".join(f"{timings[t]:>9.4f}" for t in TIMINGS)
+                + f" {timings['peak_mib']:>8.1f}"
+            )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "latency": args.latency,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 import logging
-from typing import Type, Any
+from typing import Type, Any, Callable, Optional, Union, overload
 
 from carlyleconfig.register import register
 from carlyleconfig.environment import ConfigEnvironment
@@ -8,7 +8,30 @@ from carlyleconfig.environment import ConfigEnvironment
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 
-def deriveconfig(Cls: Type[Any]) -> Type[Any]:
+@overload
+def deriveconfig(Cls: Type[Any]) -> Type[Any]: ...
+
+
+@overload
+def deriveconfig(
+    *,
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    slots: bool = False,
+    frozen: bool = False,
+    lazy: bool = False,
+) -> Callable[[Type[Any]], Type[Any]]: ...
+
+
+def deriveconfig(
+    Cls: Optional[Type[Any]] = None,
+    *,
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    slots: bool = False,
+    frozen: bool = False,
+    lazy: bool = False,
+) -> Union[Type[Any], Callable[[Type[Any]], Type[Any]]]:
     """Decorator to place on configuration class.
 
     Decorate a class to register it as a configuration class with
@@ -28,9 +51,69 @@ def deriveconfig(Cls: Type[Any]) -> Type[Any]:
                 .from_constant("default")
             )
 
+    :param parallel: Resolve keys on a thread pool instead of one at a
+        time. Keys that depend on another key, such as a file path
+        taken from another field, still wait for that key.
+    :type parallel: bool
+
+    :param workers: Maximum number of threads used to resolve keys.
+        Setting this implies ``parallel``. It can also be set per call
+        with ``Config.load(workers=N)``.
+    :type workers: Optional[int]
+
+    :param slots: Generate ``__slots__`` from the fields so instances
+        do not carry a ``__dict__``. The decorated class is replaced by
+        a new class, like ``dataclass(slots=True)`` does.
+    :type slots: bool
+
+    :param frozen: Block assignment to fields once ``__init__`` is done
+        and add ``__eq__`` and ``__hash__`` based on the field values.
+    :type frozen: bool
+
+    :param lazy: Resolve each field the first time it is read instead
+        of in ``__init__``. Call ``warm()`` on an instance to resolve
+        every remaining field up front. Cannot be combined with
+        ``slots``.
+    :type lazy: bool
+
+    Every config class also gets a ``with_overrides(**kwargs)`` method
+    returning a copy with some fields replaced. The unchanged values are
+    shared with the original instead of being resolved again.
+
+    The fields of the class are indexed by provider type, plugin,
+    sensitivity, dependency and network access in a
+    ``carlyleconfig.schema.ConfigSchema`` stored on the class as
+    ``__carlyleconfig_schema__``. ``Config.keys(has_provider=[...])``
+    is answered from it.
+
+    ``Config.load(only_providers=[...])`` memoizes the values per subset
+    of providers, so repeating it does not run the providers again
+    until ``Config.invalidate(only_providers)`` is called.
+
+    ``Config.load(context=...)`` resolves the fields in a
+    ``carlyleconfig.context.ResolutionContext``, which replaces some
+    plugins and only resolves again the keys that read from them.
+
+    ``config.snapshot(path)`` writes the resolved values to a JSON file
+    and ``Config.load(snapshot=path, max_age=seconds)`` loads them back
+    without running any provider. A missing or stale snapshot is
+    replaced after the fields are resolved. Snapshots of classes with
+    sensitive fields are only readable by their owner.
     """
-    register(Cls)
-    return Cls
+
+    def wrap(Cls: Type[Any]) -> Type[Any]:
+        return register(
+            Cls,
+            parallel=parallel,
+            workers=workers,
+            slots=slots,
+            frozen=frozen,
+            lazy=lazy,
+        )
+
+    if Cls is None:
+        return wrap
+    return wrap(Cls)
 
 
 derive = ConfigEnvironment()
@@ -0,0 +1,114 @@
+import dataclasses
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from carlyleconfig.key import ConfigKey
+from carlyleconfig.plugins.base import BasePlugin
+from carlyleconfig.plugins.envvar import EnvPrefixProvider, EnvVarProvider
+
+LOG = logging.getLogger(__name__)
+
+
+class ResolutionContext:
+    """Resolve config keys against a different set of plugins.
+
+    A context holds replacement plugins, such as an ``SSMPlugin`` with
+    another prefix or an ``EnvVarPlugin`` with another ``environ``.
+    Only the keys with a provider from one of the replaced plugins, and
+    the keys depending on those, are resolved again in the context.
+    Every other key reuses the value already resolved by its parent.
+
+    The context keeps its own copies of the keys it resolves, so their
+    values are cached per context and the keys of the config class are
+    not touched. A context can be layered on top of another one with
+    ``overlay``.
+
+    .. code-block::
+
+        tenant = ResolutionContext([SSMPlugin(prefix="/tenant-b/")])
+        config = Config.load(context=tenant)
+    """
+
+    def __init__(
+        self,
+        plugins: Iterable[BasePlugin] = (),
+        parent: Optional["ResolutionContext"] = None,
+    ) -> None:
+        self.plugins: Dict[str, BasePlugin] = {
+            plugin.name(): plugin for plugin in plugins
+        }
+        self.parent = parent
+        # Keyed by id, along with the original key to keep the id valid.
+        self._keys: Dict[int, Tuple[ConfigKey, ConfigKey]] = {}
+        self._overlays: List[ConfigKey] = []
+        self._lock = threading.RLock()
+
+    def overlay(self, plugins: Iterable[BasePlugin]) -> "ResolutionContext":
+        """Create a child context replacing more plugins on top of this one."""
+        return ResolutionContext(plugins, parent=self)
+
+    def key(self, key: ConfigKey) -> ConfigKey:
+        """The version of ``key`` to resolve in this context.
+
+        This is ``key`` itself, or the parent's version of it, unless
+        one of its providers or dependencies is affected by the plugins
+        of this context."""
+        base = self.parent.key(key) if self.parent is not None else key
+        with self._lock:
+            if id(key) not in self._keys:
+                self._keys[id(key)] = (key, self._overlay_key(base))
+            return self._keys[id(key)][1]
+
+    def resolve(
+        self, key: ConfigKey, only_providers: Optional[List[str]] = None
+    ) -> Any:
+        return self.key(key).resolve(only_providers)
+
+    def invalidate(self) -> None:
+        """Forget the values resolved in this context."""
+        with self._lock:
+            for key in self._overlays:
+                key.invalidate()
+
+    def _overlay_key(self, key: ConfigKey) -> ConfigKey:
+        providers = [self._rebind(provider) for provider in key.providers]
+        if all(new is old for new, old in zip(providers, key.providers)):
+            return key
+        LOG.debug("Resolving %s in context", key.name)
+        overlay = ConfigKey(name=key.name, sensitive=key.sensitive, providers=providers)
+        for new, old in zip(providers, key.providers):
+            if new is not old:
+                self._register(new, overlay)
+        self._overlays.append(overlay)
+        return overlay
+
+    def _register(self, provider: Any, key: ConfigKey) -> None:
+        # Refreshing the replacement plugin invalidates the keys it
+        # knows about, so it needs to know about the copied key.
+        if isinstance(provider, EnvVarProvider) and provider.plugin is not None:
+            provider.plugin.add_key(provider.value, key)
+        elif isinstance(provider, EnvPrefixProvider):
+            provider.plugin.add_prefix_key(provider.prefix, key)
+
+    def _rebind(self, provider: Any) -> Any:
+        if not dataclasses.is_dataclass(provider) or isinstance(provider, type):
+            return provider
+        changes: Dict[str, Any] = {}
+        for field in dataclasses.fields(provider):
+            value = getattr(provider, field.name)
+            if isinstance(value, BasePlugin) and value.name() in self.plugins:
+                replacement: Any = self.plugins[value.name()]
+            elif isinstance(value, ConfigKey):
+                replacement = self.key(value)
+            else:
+                continue
+            if replacement is not value:
+                changes[field.name] = replacement
+        if not changes:
+            return provider
+        # Providers that register what they read with their plugin when
+        # they are created, such as SSMProvider, register with the
+        # replacement plugin too. Env providers are registered with the
+        # copied key by _register.
+        return dataclasses.replace(provider, **changes)
@@ -1,7 +1,10 @@
 import logging
+import time
 
 from dataclasses import dataclass, field
-from typing import List, Any, Protocol, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Protocol, Tuple
+
+from carlyleconfig.metrics import METRICS
 
 
 LOG = logging.getLogger(__name__)
@@ -12,6 +15,12 @@ class Provider(Protocol):
         """Method to provide a value."""
 
 
+# Provider class name, bound provide method and the provider itself.
+Link = Tuple[str, Callable[[], Any], Provider]
+# Subset of provider types, its chain and the version methods in it.
+Filtered = Tuple[FrozenSet[str], Tuple[Link, ...], Tuple[Callable[[], Any], ...]]
+
+
 @dataclass
 class ConfigKey:
     """A class used as a placeholder in a Configuration object.
@@ -25,6 +34,84 @@ class ConfigKey:
     providers: List[Provider] = field(default_factory=lambda: [])
     _cached: Optional[Any] = None
     _resolved: bool = False
+    _source: Optional[str] = field(default=None, repr=False, compare=False)
+    _resolved_at: Optional[float] = field(default=None, repr=False, compare=False)
+    _chain: Tuple[Link, ...] = field(default=(), repr=False, compare=False)
+    _types: FrozenSet[str] = field(default=frozenset(), repr=False, compare=False)
+    _filtered: Dict[Tuple[str, ...], Filtered] = field(
+        default_factory=lambda: {}, repr=False, compare=False
+    )
+    _subsets: Dict[FrozenSet[str], Tuple[Any, Tuple[Any, ...]]] = field(
+        default_factory=lambda: {}, repr=False, compare=False
+    )
+
+    def dependencies(self) -> List["ConfigKey"]:
+        """ConfigKeys that need to be resolved before this one.
+
+        Providers can declare a ``dependencies`` attribute listing the
+        ConfigKeys they read while providing a value, such as a file
+        path that is itself derived from another key."""
+        return [
+            dependency
+            for provider in self.providers
+            for dependency in getattr(provider, "dependencies", [])
+        ]
+
+    def compile(self) -> None:
+        """Freeze the providers into a chain of bound ``provide`` methods.
+
+        This is done when the config class is registered, and again
+        whenever providers were added since, so resolving does not look
+        up methods or class names."""
+        self._chain = tuple(
+            (provider.__class__.__name__, provider.provide, provider)
+            for provider in self.providers
+        )
+        self._types = frozenset(name for name, _, _ in self._chain)
+        self._filtered = {}
+        self._subsets = {}
+
+    def chain(self, only_providers: Optional[List[str]] = None) -> Tuple[Link, ...]:
+        """The compiled chain, limited to ``only_providers`` if given."""
+        return self._filter(only_providers)[1]
+
+    def _filter(self, only_providers: Optional[List[str]]) -> Filtered:
+        if len(self._chain) != len(self.providers):
+            self.compile()
+        if not only_providers:
+            return self._types, self._chain, ()
+        key = tuple(only_providers)
+        filtered = self._filtered.get(key)
+        if filtered is None:
+            # Lists naming the same provider types of this key share one
+            # subset, and with it one memoized value.
+            subset = self._types.intersection(key)
+            chain = tuple(link for link in self._chain if link[0] in subset)
+            versions = tuple(
+                getattr(provider, "version")
+                for _, _, provider in chain
+                if callable(getattr(provider, "version", None))
+            )
+            filtered = self._filtered[key] = (subset, chain, versions)
+        return filtered
+
+    def _versions(self, versions: Tuple[Callable[[], Any], ...]) -> Tuple[Any, ...]:
+        return tuple(version() for version in versions)
+
+    def invalidate(self, only_providers: Optional[List[str]] = None) -> None:
+        """Forget cached values so the next resolve runs the providers.
+
+        :param only_providers: Only forget the value memoized for this
+            subset of providers. By default every value is forgotten.
+        """
+        if only_providers:
+            self._subsets.pop(self._filter(only_providers)[0], None)
+            return
+        self._resolved = False
+        self._cached = None
+        self._source = None
+        self._resolved_at = None
+        self._subsets = {}
 
     def resolve(self, only_providers: Optional[List[str]] = None) -> Any:
         """Resolves a ConfigKey to a value.
@@ -33,27 +120,96 @@ class ConfigKey:
         providers and returning the first non-None value provided.
 
         One a key has been resolved once, that value is cached and
-        the lookup is avoided the next time."""
+        the lookup is avoided the next time. The description of the
+        provider that gave the value and the time it was resolved are
+        kept along with it.
+
+        Values resolved with ``only_providers`` are memoized per subset
+        of provider types until ``invalidate`` is called. Providers with
+        a ``version`` method, such as those backed by a plugin cache that
+        is refreshed or revalidated, return a token that changes with
+        their data, and a memoized value is only used while the tokens
+        it was resolved with are unchanged."""
         if self._resolved is True and only_providers is None:
+            if METRICS.enabled:
+                METRICS.increment("carlyleconfig_key_cache_hits_total", key=self.name)
             return self._cached
-        LOG.debug("Resolving ConfigKey value for %s", self.name)
-        for provider in self.providers:
-            if only_providers:
-                if provider.__class__.__name__ not in only_providers:
-                    LOG.debug(
-                        "Skipping %s not in %s",
-                        provider.__class__.__name__,
-                        only_providers,
+        if only_providers:
+            subset, _, versions = self._filter(only_providers)
+            memo = self._subsets.get(subset)
+            if memo is not None and (
+                not versions or memo[1] == self._versions(versions)
+            ):
+                if METRICS.enabled:
+                    METRICS.increment(
+                        "carlyleconfig_key_cache_hits_total", key=self.name
                     )
-                    continue
-            LOG.debug("Trying provider %s", provider.__class__.__name__)
-            value = provider.provide()
+                return memo[0]
+        if not METRICS.enabled:
+            return self._resolve(only_providers)
+        start = time.perf_counter()
+        try:
+            return self._resolve(only_providers)
+        finally:
+            METRICS.increment("carlyleconfig_key_resolves_total", key=self.name)
+            METRICS.observe(
+                "carlyleconfig_key_resolve_seconds",
+                time.perf_counter() - start,
+                key=self.name,
+            )
+
+    def _resolve(self, only_providers: Optional[List[str]]) -> Any:
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        subset, chain, versions = self._filter(only_providers)
+        # Taken before the providers run, so a change while they do is
+        # seen by the next resolve.
+        tokens = self._versions(versions)
+        if debug:
+            LOG.debug("Resolving ConfigKey value for %s", self.name)
+            if only_providers:
+                LOG.debug(
+                    "Skipping %s not in %s",
+                    [name for name, _, _ in self._chain if name not in only_providers],
+                    only_providers,
+                )
+        for name, provide, provider in chain:
+            if debug:
+                LOG.debug("Trying provider %s", name)
+            if METRICS.enabled:
+                value = self._provide(name, provide)
+            else:
+                value = provide()
             if value is not None:
-                display_value = "*****" if self.sensitive else value
-                LOG.debug("%s resolved to %s", self.name, display_value)
+                if debug:
+                    display_value = "*****" if self.sensitive else value
+                    LOG.debug("%s resolved to %s", self.name, display_value)
                 if only_providers:
+                    self._subsets[subset] = (value, tokens)
                     return value
                 self._cached = value
+                self._source = getattr(provider, "description", name)
                 break
         self._resolved = True
+        self._resolved_at = time.time()
+        if only_providers:
+            self._subsets[subset] = (self._cached, tokens)
+        else:
+            # A full resolve ran the providers again, so values memoized
+            # for subsets of them may be outdated.
+            self._subsets = {}
         return self._cached
+
+    def _provide(self, name: str, provide: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return provide()
+        finally:
+            METRICS.increment(
+                "carlyleconfig_provider_calls_total", key=self.name, provider=name
+            )
+            METRICS.observe(
+                "carlyleconfig_provider_seconds",
+                time.perf_counter() - start,
+                key=self.name,
+                provider=name,
+            )
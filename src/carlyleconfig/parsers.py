@@ -0,0 +1,141 @@
+import configparser
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Tuple
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Parser:
+    """A named file parser.
+
+    Parsers are compared by name and parse function, so every key that
+    asks for the same parser shares one parsed document. A parser that
+    replaced another one of the same name compares unequal to it, so
+    documents parsed by the old parser are not served for the new one."""
+
+    name: str
+    parse: Callable[[Any], Any]
+    extensions: Tuple[str, ...] = field(default=(), compare=False)
+
+    def __call__(self, content: Any) -> Any:
+        return self.parse(content)
+
+
+class ParserRegistry:
+    """Parsers that can be selected by name or by file extension."""
+
+    def __init__(self) -> None:
+        self._parsers: Dict[str, Parser] = {}
+        self._extensions: Dict[str, str] = {}
+
+    def register(
+        self,
+        name: str,
+        parse: Callable[[Any], Any],
+        extensions: Tuple[str, ...] = (),
+        replace: bool = False,
+    ) -> Parser:
+        if name in self._parsers and not replace:
+            raise ValueError(f"A parser named '{name}' is already registered.")
+        parser = Parser(name, parse, extensions)
+        self._parsers[name] = parser
+        for extension in extensions:
+            self._extensions[extension.lower()] = name
+        return parser
+
+    def get(self, name: str) -> Parser:
+        if name not in self._parsers:
+            raise ValueError(
+                f"Unknown parser '{name}', registered parsers: {sorted(self._parsers)}"
+            )
+        return self._parsers[name]
+
+    def for_path(self, path: str) -> Parser:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in self._extensions:
+            raise ValueError(f"No parser registered for extension of '{path}'.")
+        return self._parsers[self._extensions[extension]]
+
+    def lookup(self, name: str, path: str) -> Parser:
+        """Get a parser by name, or by the extension of ``path`` for ``auto``."""
+        if name == "auto":
+            return self.for_path(path)
+        return self.get(name)
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(self._parsers)
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return bytes(content).decode("utf-8")
+
+
+def _parse_json(content: Any) -> Any:
+    if not isinstance(content, (str, bytes)):
+        content = bytes(content)
+    return json.loads(content)
+
+
+def _parse_orjson(content: Any) -> Any:
+    try:
+        # Optional dependency, it rejects NaN and Infinity and handles
+        # large integers differently, so it is only used when asked for.
+        import orjson  # type: ignore[import-not-found,unused-ignore]
+    except ImportError as e:
+        raise ImportError("orjson is required for the orjson parser.") from e
+
+    if not isinstance(content, (str, bytes)):
+        content = bytes(content)
+    return orjson.loads(content)
+
+
+def _parse_toml(content: Any) -> Any:
+    try:
+        import tomllib
+    except ImportError:
+        # tomli is the backport of tomllib for older Python versions.
+        import tomli as tomllib  # type: ignore
+    return tomllib.loads(_text(content))
+
+
+def _parse_ini(content: Any) -> Dict[str, Dict[str, str]]:
+    parser = configparser.ConfigParser()
+    parser.read_string(_text(content))
+    return {section: dict(parser[section]) for section in parser.sections()}
+
+
+def _parse_yaml(content: Any) -> Any:
+    try:
+        # The package does not depend on PyYAML, any application that
+        # loads YAML files should require it.
+        import yaml  # type: ignore
+    except ImportError as e:
+        raise ImportError("PyYAML is required to parse YAML files.") from e
+    return yaml.safe_load(_text(content))
+
+
+def default_registry() -> ParserRegistry:
+    """Registry with the built-in parsers.
+
+    ``json`` uses the standard library ``json`` module. ``orjson`` is
+    only used by name, it is never picked for an extension, and needs
+    ``orjson`` to be installed when it is used. ``toml`` uses
+    ``tomllib``, ``ini`` uses ``configparser`` and ``yaml`` needs
+    ``PyYAML`` to be installed when it is used."""
+    registry = ParserRegistry()
+    registry.register("json", _parse_json, (".json",))
+    registry.register("orjson", _parse_orjson)
+    registry.register("toml", _parse_toml, (".toml",))
+    registry.register("ini", _parse_ini, (".ini", ".cfg"))
+    registry.register("yaml", _parse_yaml, (".yaml", ".yml"))
+    LOG.debug("Registered parsers: %s", registry.names())
+    return registry
+
+
+PARSERS = default_registry()
@@ -0,0 +1,126 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+LOG = logging.getLogger(__name__)
+
+
+class DependencyCycleError(ValueError):
+    """Raised when the keys of a config class depend on each other in a loop."""
+
+    def __init__(self, cycle: List[str]) -> None:
+        self.cycle = cycle
+        super().__init__(f"Config keys have a dependency cycle: {' -> '.join(cycle)}")
+
+
+@dataclass(frozen=True)
+class ResolutionPlan:
+    """Order in which the keys of a config class are resolved.
+
+    The plan is built once when the class is registered and stored on
+    the class as ``__carlyleconfig_plan__``."""
+
+    fields: Tuple[str, ...]
+    order: Tuple[str, ...]
+    levels: Tuple[Tuple[str, ...], ...]
+    dependencies: Dict[str, FrozenSet[str]]
+    dependents: Dict[str, FrozenSet[str]]
+
+    def requires(self, names: Iterable[str]) -> Tuple[str, ...]:
+        """Keys needed to resolve ``names`` in resolution order.
+
+        This includes ``names`` themselves and everything they depend
+        on, directly or not."""
+        needed = self._closure(names, self.dependencies)
+        return tuple(name for name in self.order if name in needed)
+
+    def affected_by(self, names: Iterable[str]) -> Tuple[str, ...]:
+        """Keys that need to be resolved again when ``names`` change.
+
+        This includes ``names`` themselves and everything that depends
+        on them, directly or not."""
+        affected = self._closure(names, self.dependents)
+        return tuple(name for name in self.order if name in affected)
+
+    def _closure(
+        self, names: Iterable[str], edges: Dict[str, FrozenSet[str]]
+    ) -> Set[str]:
+        seen: Set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            pending.extend(edges[name])
+        return seen
+
+
+def build_plan(fields: Dict[str, Any]) -> ResolutionPlan:
+    """Build a ResolutionPlan for the ConfigKeys in ``fields``.
+
+    :raises DependencyCycleError: if the keys depend on each other in a
+        loop.
+    """
+    keys = {id(field): name for name, field in fields.items()}
+    dependencies = {
+        name: frozenset(_field_dependencies(field, keys))
+        for name, field in fields.items()
+    }
+    inverted: Dict[str, Set[str]] = {name: set() for name in fields}
+    for name, deps in dependencies.items():
+        for dependency in deps:
+            inverted[dependency].add(name)
+    dependents = {name: frozenset(names) for name, names in inverted.items()}
+    levels: List[Tuple[str, ...]] = []
+    done: Set[str] = set()
+    while len(done) < len(fields):
+        level = tuple(
+            name
+            for name in fields
+            if name not in done and dependencies[name].issubset(done)
+        )
+        if not level:
+            raise DependencyCycleError(_find_cycle(dependencies, done))
+        levels.append(level)
+        done.update(level)
+    order = tuple(name for level in levels for name in level)
+    LOG.debug("Built resolution plan: %s", levels)
+    return ResolutionPlan(
+        fields=tuple(fields),
+        order=order,
+        levels=tuple(levels),
+        dependencies=dependencies,
+        dependents=dependents,
+    )
+
+
+def _field_dependencies(field: Any, names: Dict[int, str]) -> Set[str]:
+    # Keys that are not members of the class can still sit between two
+    # fields, so walk through them to find the fields they depend on.
+    found: Set[str] = set()
+    seen: Set[int] = set()
+    pending = list(field.dependencies())
+    while pending:
+        dependency = pending.pop()
+        if id(dependency) in seen:
+            continue
+        seen.add(id(dependency))
+        if id(dependency) in names:
+            found.add(names[id(dependency)])
+        else:
+            pending.extend(dependency.dependencies())
+    return found
+
+
+def _find_cycle(dependencies: Dict[str, FrozenSet[str]], done: Set[str]) -> List[str]:
+    start = next(name for name in dependencies if name not in done)
+    path = [start]
+    while True:
+        current = path[-1]
+        following = next(
+            name for name in sorted(dependencies[current]) if name not in done
+        )
+        if following in path:
+            return path[path.index(following) :] + [following]
+        path.append(following)
@@ -1,11 +1,16 @@
+import itertools
 import json
 import logging
-from dataclasses import dataclass
-from typing import Any, ClassVar, Dict, Optional, Protocol, Callable
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Optional, Protocol, Callable, cast
 from types import MethodType
 
 from carlyleconfig.plugins.base import BasePlugin
 from carlyleconfig.key import ConfigKey
+from carlyleconfig.metrics import METRICS
 
 LOG = logging.getLogger(__name__)
 
@@ -16,6 +21,31 @@ class SecretFetcher(Protocol):
     def get_secret_value(self, SecretId: str) -> Dict[str, str]: ...
 
 
+class BatchSecretFetcher(SecretFetcher, Protocol):
+    def batch_get_secret_value(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+
+_UNPARSED = object()
+
+
+@dataclass
+class CachedSecret:
+    """A fetched secret along with its parsed JSON document.
+
+    The document is parsed the first time it is asked for and shared by
+    every provider that reads a key from the same secret."""
+
+    value: Optional[str]
+    fetched_at: float
+    generation: int = 0
+    _document: Any = _UNPARSED
+
+    def document(self) -> Any:
+        if self._document is _UNPARSED:
+            self._document = None if self.value is None else json.loads(self.value)
+        return self._document
+
+
 @dataclass
 class SecretsManagerProvider:
     name: str
@@ -24,30 +54,36 @@ class SecretsManagerProvider:
     cast: Optional[Callable[[str], Any]] = None
     require_key: bool = False
 
+    def __post_init__(self) -> None:
+        self.plugin.add_name(self.name)
+
     @property
     def description(self) -> str:
         return "AWS Secrets Manager"
 
-    def provide(self) -> Optional[str]:
-        value = self.plugin.get_secret(self.name)
-        value = self._extract_from_json(value)
+    def provide(self) -> Any:
+        if self.key is None:
+            value = self.plugin.get_secret(self.name)
+        else:
+            value = self._extract_from_json(self.plugin.get_secret_document(self.name))
         value = self._cast(value)
         LOG.debug("Providing: %s", value)
         return value
 
-    def _extract_from_json(self, value: Optional[str]) -> Optional[str]:
-        if value is not None and self.key is not None:
-            json_value = json.loads(value)
-            if self.key not in json_value:
-                LOG.debug("Secret %s did not have key %s", self.name, self.key)
-                if self.require_key:
-                    raise RuntimeError(
-                        f"Key '{self.key}' was missing from secret '{self.name}'."
-                    )
-                return None
+    def version(self) -> int:
+        return self.plugin.version(self.name)
 
-            value = json_value[self.key]
-        return value
+    def _extract_from_json(self, json_value: Any) -> Any:
+        if json_value is None:
+            return None
+        if self.key not in json_value:
+            LOG.debug("Secret %s did not have key %s", self.name, self.key)
+            if self.require_key:
+                raise RuntimeError(
+                    f"Key '{self.key}' was missing from secret '{self.name}'."
+                )
+            return None
+        return json_value[self.key]
 
     def _cast(self, value: Any) -> Any:
         if value is not None and self.cast is not None:
@@ -80,17 +116,105 @@ def wrapper(
 
 @dataclass
 class SecretsManagerPlugin(BasePlugin):
+    _MAX_BATCH_NAMES: ClassVar[int] = 20
     client: Optional[SecretFetcher] = None
     factory_name: ClassVar[str] = "secrets_manager"
+    remote: ClassVar[bool] = True
+    names: List[str] = field(default_factory=lambda: [])
+    cache_ttl: Optional[float] = None
+    cache_size: int = 128
+    clock: Callable[[], float] = time.monotonic
+    _cache: "OrderedDict[str, CachedSecret]" = field(
+        default_factory=OrderedDict, repr=False, compare=False
+    )
+    _lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+    _generations: "itertools.count[int]" = field(
+        default_factory=lambda: itertools.count(1), repr=False, compare=False
+    )
 
     @property
     def provider_name(self) -> str:
         return "SecretsManagerProvider"
 
+    def add_name(self, name: str) -> None:
+        if name not in self.names:
+            self.names.append(name)
+
     def get_secret(self, name: str) -> Optional[str]:
-        return self._fetch(name)
+        return self._cached(name).value
 
-    def _fetch(self, name: str) -> Optional[str]:
+    def get_secret_document(self, name: str) -> Any:
+        """Get a secret parsed as JSON, or None if it does not exist."""
+        with self._lock:
+            return self._cached(name).document()
+
+    def version(self, name: str) -> int:
+        """Changes whenever the cached value of a secret is fetched again."""
+        return self._cached(name).generation
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one secret, or every secret, from the cache."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+
+    def _cached(self, name: str) -> CachedSecret:
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry is not None and not self._expired(entry):
+                LOG.debug("Secret %s found in cache", name)
+                METRICS.increment("carlyleconfig_cache_hits_total", cache="secrets")
+                self._cache.move_to_end(name)
+                return entry
+            if entry is not None:
+                METRICS.increment(
+                    "carlyleconfig_cache_expirations_total", cache="secrets"
+                )
+            METRICS.increment("carlyleconfig_cache_misses_total", cache="secrets")
+            # With the batch API, fetch every other registered secret that
+            # is not cached yet along with this one, so a cold start costs
+            # one batch call instead of one call per secret.
+            prefetch = []
+            if hasattr(self._get_client(), "batch_get_secret_value"):
+                prefetch = [
+                    other
+                    for other in self.names
+                    if other != name and self._needs_fetch(other)
+                ][: self.cache_size - 1]
+            fetched_at = self.clock()
+            values = self._fetch_many(name, prefetch)
+            generation = next(self._generations)
+            for other in prefetch:
+                if other in values:
+                    self._store(
+                        other, CachedSecret(values[other], fetched_at, generation)
+                    )
+            entry = CachedSecret(values[name], fetched_at, generation)
+            self._store(name, entry)
+            return entry
+
+    def _needs_fetch(self, name: str) -> bool:
+        entry = self._cache.get(name)
+        return entry is None or self._expired(entry)
+
+    def _store(self, name: str, entry: CachedSecret) -> None:
+        self._cache[name] = entry
+        self._cache.move_to_end(name)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            LOG.debug("Evicted secret %s from cache", evicted)
+            METRICS.increment("carlyleconfig_cache_evictions_total", cache="secrets")
+
+    def _expired(self, entry: CachedSecret) -> bool:
+        if self.cache_ttl is None:
+            return False
+        return self.clock() - entry.fetched_at >= self.cache_ttl
+
+    def _get_client(self) -> SecretFetcher:
         if self.client is None:
             # The package does not depend on boto3, any application that
             # uses the config package to load secrets itself should
@@ -98,15 +222,81 @@ class SecretsManagerPlugin(BasePlugin):
             import boto3  # type: ignore
 
             self.client = boto3.client("secretsmanager")  # type: SecretFetcher
+        return self.client
+
+    def _fetch_many(self, name: str, prefetch: List[str]) -> Dict[str, Optional[str]]:
+        """Fetch ``name`` along with the secrets in ``prefetch``.
+
+        Only ``name`` is guaranteed to be in the result, and only errors
+        fetching it are raised. Prefetched secrets that failed are left
+        out so they are fetched again when they are asked for."""
+        if not prefetch:
+            return {name: self._fetch(name)}
+        client = cast(BatchSecretFetcher, self._get_client())
+        names = [name] + prefetch
+        values: Dict[str, Optional[str]] = {}
+        for i in range(0, len(names), self._MAX_BATCH_NAMES):
+            chunk = names[i : i + self._MAX_BATCH_NAMES]
+            try:
+                values.update(self._fetch_batch(client, chunk))
+            except Exception:
+                # Such as a role without secretsmanager:BatchGetSecretValue,
+                # the requested secret is fetched on its own below.
+                LOG.debug("Batch fetch of secrets failed", exc_info=True)
+                break
+        if name not in values:
+            values[name] = self._fetch(name)
+        return values
+
+    def _fetch_batch(
+        self, client: BatchSecretFetcher, names: List[str]
+    ) -> Dict[str, Optional[str]]:
+        values: Dict[str, Optional[str]] = {}
+        kwargs: Dict[str, Any] = {"SecretIdList": names}
+        while True:
+            METRICS.increment(
+                "carlyleconfig_remote_calls_total",
+                service="secretsmanager",
+                operation="BatchGetSecretValue",
+            )
+            result = client.batch_get_secret_value(**kwargs)
+            LOG.debug(
+                "Fetched secrets: %s",
+                [v.get("Name") for v in result.get("SecretValues", [])],
+            )
+            for secret in result.get("SecretValues", []):
+                for secret_id in (secret.get("Name"), secret.get("ARN")):
+                    if secret_id in names:
+                        values[secret_id] = secret.get("SecretString")
+            for error in result.get("Errors", []):
+                if error.get("ErrorCode") == "ResourceNotFoundException":
+                    LOG.debug("Could not find secret %s", error.get("SecretId"))
+                    values[error["SecretId"]] = None
+                else:
+                    # Left out, the secret is fetched on its own when it
+                    # is asked for, so its error surfaces there.
+                    LOG.debug("Batch fetch of secret failed: %s", error)
+            if not result.get("NextToken"):
+                break
+            kwargs["NextToken"] = result["NextToken"]
+        return values
+
+    def _fetch(self, name: str) -> Optional[str]:
+        client = self._get_client()
+        METRICS.increment(
+            "carlyleconfig_remote_calls_total",
+            service="secretsmanager",
+            operation="GetSecretValue",
+        )
         try:
-            result = self.client.get_secret_value(
+            result = client.get_secret_value(
                 SecretId=name,
             )
             if "SecretString" in result:
                 secret = result["SecretString"]
                 return secret
             return None
-        except self.client.exceptions.ResourceNotFoundException:
+        except client.exceptions.ResourceNotFoundException:
             LOG.debug("Could not find secret %s", name)
             return None
 
@@ -8,6 +8,8 @@ from carlyleconfig.key import ConfigKey
 @dataclass
 class BasePlugin(ABC):
     factory_name: ClassVar[str]
+    # Whether the plugin's providers make network calls.
+    remote: ClassVar[bool] = False
 
     def inject_factory_method(self, key: ConfigKey) -> None:
         raise NotImplementedError("inject_factory_method")
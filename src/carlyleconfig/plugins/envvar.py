@@ -1,7 +1,18 @@
 import os
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import Any, ClassVar, Dict, Callable, Optional
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 from types import MethodType
 
 from carlyleconfig.plugins.base import BasePlugin
@@ -16,7 +27,8 @@ class EnvVarProvider:
     value: str
     sensitive: bool = False
     cast: Optional[Callable[[str], Any]] = None
-    environ: Dict[str, str] = field(default_factory=lambda: os.environ.copy())
+    environ: Optional[Mapping[str, str]] = None
+    plugin: Optional["EnvVarPlugin"] = field(default=None, repr=False)
 
     @property
     def description(self) -> str:
@@ -24,7 +36,7 @@ class EnvVarProvider:
 
     def provide(self) -> Any:
         LOG.debug("Fetching env var '%s'", self.value)
-        value = self.environ.get(self.value)
+        value = self._environ().get(self.value)
         LOG.debug("Got value: %s", value if not self.sensitive else "*****")
         if value is not None and self.cast is not None:
             LOG.debug("Casting with %s", self.cast)
@@ -32,23 +44,236 @@ class EnvVarProvider:
         LOG.debug("Providing: %s", value if not self.sensitive else "*****")
         return value
 
+    def _environ(self) -> Mapping[str, str]:
+        if self.environ is not None:
+            return self.environ
+        if self.plugin is not None:
+            return self.plugin.snapshot()
+        return os.environ
 
-def with_env_var(
-    self: ConfigKey, name: str, cast: Optional[Callable[[str], Any]] = None
-) -> ConfigKey:
-    provider = EnvVarProvider(name, sensitive=self.sensitive, cast=cast)
-    self.providers.append(provider)
-    return self
+
+@dataclass
+class EnvPrefixProvider:
+    prefix: str
+    plugin: "EnvVarPlugin" = field(repr=False)
+    separator: Optional[str] = "__"
+    sensitive: bool = False
+    cast: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+    @property
+    def description(self) -> str:
+        return f"environment variables {self.prefix}*"
+
+    def provide(self) -> Any:
+        LOG.debug("Fetching env vars with prefix '%s'", self.prefix)
+        variables = self.plugin.prefixed(self.prefix)
+        if not variables:
+            LOG.debug("No env vars with prefix '%s'", self.prefix)
+            return None
+        value: Any = self._nest(variables)
+        if self.cast is not None:
+            LOG.debug("Casting with %s", self.cast)
+            value = self.cast(value)
+        LOG.debug("Providing: %s", value if not self.sensitive else "*****")
+        return value
+
+    def _nest(self, variables: Dict[str, str]) -> Dict[str, Any]:
+        nested: Dict[str, Any] = {}
+        for name in sorted(variables):
+            if self.separator:
+                path = name.lower().split(self.separator)
+            else:
+                path = [name.lower()]
+            current = nested
+            for part in path[:-1]:
+                current = current.setdefault(part, {})
+                if not isinstance(current, dict):
+                    raise ValueError(self._conflict(name))
+            if path[-1] in current:
+                raise ValueError(self._conflict(name))
+            current[path[-1]] = variables[name]
+        return nested
+
+    def _conflict(self, name: str) -> str:
+        return (
+            f"Environment variable '{self.prefix}{name}' is both a value and "
+            f"a section of '{self.prefix}'."
+        )
+
+
+def wrapper(
+    plugin: "EnvVarPlugin",
+) -> Callable[[ConfigKey, str, Optional[Callable[[str], Any]]], ConfigKey]:
+    def with_env_var(
+        self: ConfigKey, name: str, cast: Optional[Callable[[str], Any]] = None
+    ) -> ConfigKey:
+        provider = EnvVarProvider(
+            name, sensitive=self.sensitive, cast=cast, plugin=plugin
+        )
+        plugin.add_key(name, self)
+        self.providers.append(provider)
+        return self
+
+    return with_env_var
+
+
+def prefix_wrapper(
+    plugin: "EnvVarPlugin",
+) -> Callable[
+    [ConfigKey, str, Optional[str], Optional[Callable[[Dict[str, Any]], Any]]],
+    ConfigKey,
+]:
+    def with_env_prefix(
+        self: ConfigKey,
+        prefix: str,
+        separator: Optional[str] = "__",
+        cast: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> ConfigKey:
+        provider = EnvPrefixProvider(
+            prefix, plugin, separator=separator, sensitive=self.sensitive, cast=cast
+        )
+        plugin.add_prefix_key(prefix, self)
+        self.providers.append(provider)
+        return self
+
+    return with_env_prefix
 
 
 @dataclass
 class EnvVarPlugin(BasePlugin):
+    """Load config values from environment variables.
+
+    The environment is copied the first time a key resolves and that
+    snapshot is shared by every key of the plugin. Declaring another
+    key marks the snapshot stale, so the next resolve copies the
+    environment again and keys declared later see variables set before
+    they were declared. Call ``refresh()`` to take a new snapshot. Both
+    invalidate the keys whose variables changed."""
+
     factory_name: ClassVar[str] = "env_var"
+    environ: Optional[Dict[str, str]] = None
+    _keys: Dict[str, List[ConfigKey]] = field(
+        default_factory=lambda: {}, repr=False, compare=False
+    )
+    _prefix_keys: Dict[str, List[ConfigKey]] = field(
+        default_factory=lambda: {}, repr=False, compare=False
+    )
+    _snapshot: Optional[Dict[str, str]] = field(default=None, repr=False, compare=False)
+    _stale: bool = field(default=False, repr=False, compare=False)
+    _index: Dict[str, Dict[str, str]] = field(
+        default_factory=lambda: {}, repr=False, compare=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
 
     @property
     def provider_name(self) -> str:
         return "EnvVarProvider"
 
+    def snapshot(self) -> Dict[str, str]:
+        """The shared copy of the environment.
+
+        With an explicit ``environ`` that mapping itself is used, and a
+        copy of it is kept for ``refresh()`` to compare against."""
+        if self.environ is not None:
+            if self._snapshot is None:
+                with self._lock:
+                    if self._snapshot is None:
+                        self._snapshot = dict(self.environ)
+            return self.environ
+        if self._snapshot is None or self._stale:
+            self._replace(stale_only=True)
+        return self._snapshot or {}
+
+    def add_key(self, name: str, key: ConfigKey) -> None:
+        with self._lock:
+            self._keys.setdefault(name, []).append(key)
+            self._stale = self.environ is None and self._snapshot is not None
+
+    def add_prefix_key(self, prefix: str, key: ConfigKey) -> None:
+        with self._lock:
+            self._prefix_keys.setdefault(prefix, []).append(key)
+            self._stale = self.environ is None and self._snapshot is not None
+
+    def prefixed(self, prefix: str) -> Dict[str, str]:
+        """Variables starting with ``prefix``, keyed without the prefix.
+
+        The snapshot is scanned once for every declared prefix the
+        first time one of them is asked for, later lookups only read
+        the index."""
+        environ = self.snapshot()
+        index = self._index
+        if prefix not in index:
+            with self._lock:
+                if prefix not in self._index:
+                    prefixes = set(self._prefix_keys) | {prefix}
+                    self._index = self._scan(environ, prefixes)
+                index = self._index
+        return index[prefix]
+
+    def refresh(self) -> Set[str]:
+        """Take a new snapshot of the environment.
+
+        Only the keys reading a variable that was added, removed or
+        changed since the last snapshot are invalidated. A plugin with
+        an explicit ``environ`` compares the current contents of that
+        mapping instead of ``os.environ``.
+
+        :returns: The names of the declared variables that changed.
+        """
+        return self._replace()
+
+    def _replace(self, stale_only: bool = False) -> Set[str]:
+        # A snapshot replaced because keys were declared goes through the
+        # same diff as refresh(), so keys that cached values from the old
+        # snapshot are invalidated and later refreshes compare against
+        # what is actually served.
+        with self._lock:
+            if stale_only and self._snapshot is not None and not self._stale:
+                return set()
+            previous = self._snapshot
+            current = dict(os.environ if self.environ is None else self.environ)
+            self._snapshot = current
+            self._stale = False
+            self._index = {}
+            if previous is None:
+                return set()
+            prefixes = tuple(self._prefix_keys)
+            changed = {
+                name
+                for name in previous.keys() | current.keys()
+                if previous.get(name) != current.get(name)
+                and (name in self._keys or name.startswith(prefixes))
+            }
+            keys = [key for name in changed for key in self._keys.get(name, [])]
+            keys.extend(
+                key
+                for prefix, prefix_keys in self._prefix_keys.items()
+                if any(name.startswith(prefix) for name in changed)
+                for key in prefix_keys
+            )
+        if changed:
+            LOG.debug("Environment variables changed: %s", sorted(changed))
+        for key in keys:
+            key.invalidate()
+        return changed
+
+    def _scan(
+        self, environ: Dict[str, str], prefixes: Set[str]
+    ) -> Dict[str, Dict[str, str]]:
+        index: Dict[str, Dict[str, str]] = {prefix: {} for prefix in prefixes}
+        ordered: Tuple[str, ...] = tuple(prefixes)
+        for name, value in environ.items():
+            if not name.startswith(ordered):
+                continue
+            for prefix in ordered:
+                if name.startswith(prefix) and len(name) > len(prefix):
+                    index[prefix][name[len(prefix) :]] = value
+        LOG.debug("Indexed env vars for prefixes %s", sorted(prefixes))
+        return index
+
     def inject_factory_method(self, key: ConfigKey) -> None:
         name = f"from_{self.factory_name}"
-        setattr(key, name, MethodType(with_env_var, key))
+        setattr(key, name, MethodType(wrapper(self), key))
+        setattr(key, "from_env_prefix", MethodType(prefix_wrapper(self), key))
@@ -1,7 +1,22 @@
 import os
-import json
+import hashlib
+import itertools
 import logging
-from typing import Any, ClassVar, Union, Dict, Callable, Tuple, TypeVar
+import mmap
+import time
+from functools import lru_cache
+from typing import (
+    Any,
+    ClassVar,
+    Union,
+    Dict,
+    Callable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 from dataclasses import dataclass, field
 from types import MethodType
@@ -10,7 +25,9 @@ import jmespath as jp  # type: ignore
 
 from carlyleconfig.plugins.base import BasePlugin
 from carlyleconfig.key import ConfigKey
+from carlyleconfig.metrics import METRICS
 from carlyleconfig.utils import OSUtils
+from carlyleconfig.parsers import PARSERS, ParserRegistry
 
 LOG = logging.getLogger(__name__)
 
@@ -20,47 +37,89 @@ U = TypeVar("U")
 ParserType = Callable[[str | bytes], T]
 SelectorType = Callable[[T], U]
 
+READ_MODES = ("text", "binary", "mmap")
+
+CacheKey = Tuple[str, ParserType[str], str]
+
 
 def identity(x: Any) -> Any:
     return x
 
 
+@lru_cache(maxsize=1024)
+def compile_jmespath(expression: str) -> Any:
+    """Compile a JMESPath expression once per process.
+
+    Keys using the same expression share the compiled object, and with
+    it the same ``search`` selector."""
+    return jp.compile(expression)
+
+
 @dataclass
 class FileProvider:
     plugin: "FilePlugin"
     filename: Union[str, ConfigKey]
     parser: ParserType[str] = identity
     selector: SelectorType[str, Any] = identity
+    read_mode: str = "text"
+
+    def __post_init__(self) -> None:
+        if self.read_mode not in READ_MODES:
+            raise ValueError(
+                f"read_mode must be one of {READ_MODES}, got {self.read_mode!r}"
+            )
+        if isinstance(self.filename, str):
+            self.plugin.add_selector(
+                self.path(), self.parser, self.read_mode, self.selector
+            )
 
     @property
     def description(self) -> str:
         return f"file {self.filename}"
 
-    def provide(self) -> Any:
+    @property
+    def dependencies(self) -> List[ConfigKey]:
+        if isinstance(self.filename, ConfigKey):
+            return [self.filename]
+        return []
+
+    def path(self) -> str:
         path = self.filename
         if isinstance(self.filename, ConfigKey):
             path = self.filename.resolve()
-        path = os.path.abspath(os.path.expanduser(str(path)))
+        return os.path.abspath(os.path.expanduser(str(path)))
+
+    def version(self) -> int:
+        return self.plugin.version(self.path(), self.parser, self.read_mode)
+
+    def provide(self) -> Any:
+        path = self.path()
         LOG.debug("Fetching file %s", path)
-        content = self.plugin.read_file(path, self.parser)
-        LOG.debug("Parsed type: %s content:\n%s", type(content), content)
-        if content is None:
-            return None
-        selected = self.selector(content)
+        selected = self.plugin.select(path, self.parser, self.read_mode, self.selector)
         LOG.debug("Providing: %s", selected)
         return selected
 
 
 def wrapper(
     plugin: "FilePlugin",
-) -> Callable[[ConfigKey, str, ParserType[str], SelectorType[str, Any]], ConfigKey]:
+) -> Callable[
+    [ConfigKey, str, Union[str, ParserType[str]], SelectorType[str, Any], str],
+    ConfigKey,
+]:
     def with_file(
         self: ConfigKey,
         filename: str,
-        parser: ParserType[str] = identity,
+        parser: Union[str, ParserType[str]] = identity,
         selector: SelectorType[str, Any] = identity,
+        read_mode: str = "text",
     ) -> ConfigKey:
-        self.providers.append(FileProvider(plugin, filename, parser, selector))
+        if isinstance(parser, str):
+            if not isinstance(filename, str) and parser == "auto":
+                raise ValueError("The auto parser needs a static filename.")
+            parser = plugin.parsers.lookup(parser, str(filename))
+        self.providers.append(
+            FileProvider(plugin, filename, parser, selector, read_mode=read_mode)
+        )
         return self
 
     return with_file
@@ -68,38 +127,221 @@ def wrapper(
 
 def json_wrapper(plugin: "FilePlugin") -> Callable[[ConfigKey, str, str], ConfigKey]:
     def with_json_file(self: ConfigKey, filename: str, jmespath: str) -> ConfigKey:
-        parser = json.loads
-        selector = jp.compile(jmespath).search
+        parser = plugin.parsers.get("json")
+        selector = compile_jmespath(jmespath).search
         self.providers.append(FileProvider(plugin, filename, parser, selector))
         return self
 
     return with_json_file
 
 
+@dataclass
+class CachedFile:
+    signature: Optional[Tuple[int, ...]]
+    checked_at: float
+    content: Any
+    selections: Optional[Dict[Any, Any]] = None
+    document_key: Optional[Tuple[bytes, Any]] = None
+    generation: int = 0
+
+
 @dataclass
 class FilePlugin(BasePlugin):
     factory_name: ClassVar[str] = "file"
-    _cache: Dict[Tuple[str, ParserType[str]], Any] = field(default_factory=lambda: {})
+    _cache: Dict[CacheKey, CachedFile] = field(default_factory=lambda: {})
     osutils: OSUtils = field(default_factory=lambda: OSUtils())
+    _selectors: Dict[CacheKey, List[SelectorType[str, Any]]] = field(
+        default_factory=lambda: {}
+    )
+    check_interval: Optional[float] = 1.0
+    clock: Callable[[], float] = time.monotonic
+    parsers: ParserRegistry = field(default_factory=lambda: PARSERS)
+    _documents: Dict[Tuple[bytes, Any], Any] = field(default_factory=lambda: {})
+    _document_users: Dict[Tuple[bytes, Any], Set[CacheKey]] = field(
+        default_factory=lambda: {}
+    )
+    _paths: Dict[str, Set[CacheKey]] = field(default_factory=lambda: {})
+    _generations: "itertools.count[int]" = field(
+        default_factory=lambda: itertools.count(1)
+    )
 
     @property
     def provider_name(self) -> str:
         return "FileProvider"
 
-    def read_file(self, path: str, parser: ParserType[str]) -> Any:
-        if (path, parser) not in self._cache:
+    def read_file(
+        self, path: str, parser: ParserType[str], read_mode: str = "text"
+    ) -> Any:
+        """Read and parse a file, caching the parsed result.
+
+        :param read_mode: ``text`` passes the decoded ``str`` contents to
+            the parser, ``binary`` passes ``bytes``, and ``mmap`` passes
+            a read-only ``mmap.mmap`` of the file so large files are not
+            copied into memory before parsing. The map is closed once the
+            parser returns, so the parser must copy anything it keeps. If
+            it returns the map itself a ``bytes`` copy is cached instead.
+        """
+        entry = self._cache.get((path, parser, read_mode))
+        now = self.clock()
+        if entry is not None:
+            if (
+                self.check_interval is None
+                or now - entry.checked_at < self.check_interval
+            ):
+                METRICS.increment("carlyleconfig_cache_hits_total", cache="file")
+                return entry.content
+            signature = self.osutils.stat(path)
+            entry.checked_at = now
+            if signature == entry.signature:
+                METRICS.increment("carlyleconfig_cache_hits_total", cache="file")
+                return entry.content
+            LOG.debug("%s changed on disk, reloading", path)
+        else:
             LOG.debug("%s not in cache, trying to load", (path, parser))
+            signature = self.osutils.stat(path)
+        METRICS.increment("carlyleconfig_cache_misses_total", cache="file")
+        # The signature is taken before reading, if the file changes in
+        # between the next check sees a different signature and reads it
+        # again.
+        try:
+            raw = self._read(path, read_mode)
+        except FileNotFoundError:
+            LOG.debug("%s does not exist", path)
+            raw = None
+        content = document_key = None
+        if raw is not None:
+            LOG.debug("%s found, loading content:\n%s", path, raw)
+            try:
+                content, document_key = self._parse(raw, parser)
+            finally:
+                if isinstance(raw, mmap.mmap):
+                    raw.close()
+        cache_key = (path, parser, read_mode)
+        previous = self._cache.get(cache_key)
+        self._cache[cache_key] = CachedFile(
+            signature,
+            now,
+            content,
+            document_key=document_key,
+            generation=next(self._generations),
+        )
+        self._paths.setdefault(path, set()).add(cache_key)
+        if previous is not None and previous.document_key != document_key:
+            self._release(cache_key, previous)
+        if document_key is not None:
+            self._document_users.setdefault(document_key, set()).add(cache_key)
+        return content
+
+    def version(
+        self, path: str, parser: ParserType[str], read_mode: str = "text"
+    ) -> int:
+        """Changes whenever the file is read again.
+
+        The file is revalidated first, the same way ``read_file`` does
+        after ``check_interval``."""
+        self.read_file(path, parser, read_mode)
+        return self._cache[(path, parser, read_mode)].generation
+
+    def _parse(self, content: Any, parser: ParserType[str]) -> Tuple[Any, Any]:
+        # Documents are shared by content hash and parser, so the same
+        # content is parsed and kept in memory once no matter how many
+        # paths or keys it is read through.
+        raw = content.encode() if isinstance(content, str) else content
+        document_key = (hashlib.blake2b(raw).digest(), parser)
+        if document_key in self._documents:
+            LOG.debug("Reusing document parsed with %s", parser)
+        else:
+            LOG.debug("Parsing with %s", parser)
+            parsed = parser(content)
+            if isinstance(parsed, mmap.mmap):
+                # The map is closed once parsing is done.
+                parsed = bytes(parsed)
+            self._documents[document_key] = parsed
+        return self._documents[document_key], document_key
+
+    def _release(self, cache_key: CacheKey, entry: CachedFile) -> None:
+        if entry.document_key is None:
+            return
+        users = self._document_users.get(entry.document_key, set())
+        users.discard(cache_key)
+        if users:
+            return
+        self._document_users.pop(entry.document_key, None)
+        if self._documents.pop(entry.document_key, None) is not None:
+            METRICS.increment(
+                "carlyleconfig_cache_evictions_total", cache="file_document"
+            )
+
+    def add_selector(
+        self,
+        path: str,
+        parser: ParserType[str],
+        read_mode: str,
+        selector: SelectorType[str, Any],
+    ) -> None:
+        """Register a selector to be run in the batch for its file."""
+        selectors = self._selectors.setdefault((path, parser, read_mode), [])
+        if selector not in selectors:
+            selectors.append(selector)
+
+    def select(
+        self,
+        path: str,
+        parser: ParserType[str],
+        read_mode: str,
+        selector: SelectorType[str, Any],
+    ) -> Any:
+        """Select a value out of a parsed file.
+
+        The first time a file is selected from after being loaded, every
+        selector registered for it is run in one batch and the results
+        are stored with the cached document. Later selections from the
+        same document are dictionary lookups."""
+        content = self.read_file(path, parser, read_mode)
+        if content is None:
+            return None
+        entry = self._cache[(path, parser, read_mode)]
+        if entry.selections is None:
+            entry.selections = self._select_all(
+                content, self._selectors.get((path, parser, read_mode), [])
+            )
+        if selector not in entry.selections:
+            entry.selections[selector] = selector(content)
+        return entry.selections[selector]
+
+    def _select_all(
+        self, content: Any, selectors: List[SelectorType[str, Any]]
+    ) -> Dict[Any, Any]:
+        LOG.debug("Running %s selectors in one batch", len(selectors))
+        selections = {}
+        for selector in selectors:
             try:
-                content = self.osutils.read_file(path)
-            except FileNotFoundError:
-                LOG.debug("%s does not exist", path)
-                content = None
-            if content is not None:
-                LOG.debug("%s found, loading content:\n%s", path, content)
-                LOG.debug("Parsing with %s", parser)
-                content = parser(content)
-            self._cache[(path, parser)] = content
-        return self._cache[(path, parser)]
+                selections[selector] = selector(content)
+            except Exception:
+                # Left out of the batch, the error is raised to the key
+                # that asks for this selector.
+                LOG.debug("Selector %s failed", selector, exc_info=True)
+        return selections
+
+    def _read(self, path: str, read_mode: str) -> Any:
+        if read_mode == "mmap":
+            return self.osutils.map_file(path)
+        if read_mode == "binary":
+            return self.osutils.read_file(path, binary=True)
+        return self.osutils.read_file(path)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop one file, or every file, from the cache."""
+        if path is None:
+            self._cache.clear()
+            self._documents.clear()
+            self._document_users.clear()
+            self._paths.clear()
+            return
+        for key in self._paths.pop(path, set()):
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                self._release(key, entry)
 
     def inject_factory_method(self, key: ConfigKey) -> None:
         name = f"from_{self.factory_name}"
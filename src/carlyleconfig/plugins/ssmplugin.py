@@ -1,10 +1,25 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, ClassVar, Dict, List, Optional, Protocol, Callable, Generator
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Callable,
+    Generator,
+    cast,
+)
 from types import MethodType
 
 from carlyleconfig.plugins.base import BasePlugin
 from carlyleconfig.key import ConfigKey
+from carlyleconfig.metrics import METRICS
+from carlyleconfig.utils import RetryPolicy
 
 LOG = logging.getLogger(__name__)
 
@@ -15,6 +30,10 @@ class ParameterFetcher(Protocol):
     ) -> Dict[str, Any]: ...
 
 
+class ParameterPathFetcher(ParameterFetcher, Protocol):
+    def get_parameters_by_path(self, **kwargs: Any) -> Dict[str, Any]: ...
+
+
 @dataclass
 class SSMProvider:
     name: str
@@ -28,6 +47,9 @@ class SSMProvider:
     def description(self) -> str:
         return f"AWS SSM Parameter {self.plugin.prefix}{self.name}"
 
+    def version(self) -> int:
+        return self.plugin.version()
+
     def provide(self) -> Optional[str]:
         value = self.plugin.value_for_name(self.name)
         if value is not None and self.cast is not None:
@@ -55,8 +77,38 @@ class SSMPlugin(BasePlugin):
     prefix: str = ""
     client: Optional[ParameterFetcher] = None
     factory_name: ClassVar[str] = "ssm_parameter"
+    remote: ClassVar[bool] = True
     names: List[str] = field(default_factory=lambda: [])
     cache: Optional[Dict[str, str]] = None
+    max_workers: int = 1
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    invalid_parameters: List[str] = field(default_factory=lambda: [])
+    path: Optional[str] = None
+    recursive: bool = True
+    ttl: Optional[float] = None
+    clock: Callable[[], float] = time.monotonic
+    versions: Dict[str, int] = field(default_factory=lambda: {})
+    _fetched_at: float = field(default=0.0, repr=False, compare=False)
+    _generation: int = field(default=0, repr=False, compare=False)
+    _pending: List[str] = field(default_factory=lambda: [], repr=False, compare=False)
+    _subscribers: List[Callable[[Dict[str, Optional[str]]], None]] = field(
+        default_factory=lambda: [], repr=False, compare=False
+    )
+    _refresher: Optional[threading.Thread] = field(
+        default=None, repr=False, compare=False
+    )
+    _stop_refresher: threading.Event = field(
+        default_factory=threading.Event, repr=False, compare=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+    _refresh_lock: threading.RLock = field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+    _refreshing: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
 
     @property
     def provider_name(self) -> str:
@@ -67,16 +119,196 @@ class SSMPlugin(BasePlugin):
 
     def add_name(self, name: str) -> None:
         self.names.append(name)
+        # Names added once the parameters were fetched, such as by a
+        # ResolutionContext rebinding providers to this plugin, are
+        # fetched on the next read.
+        if self.cache is not None and not (
+            self.path is not None and self._in_path(self.fullname(name), self.path)
+        ):
+            with self._lock:
+                self._pending.append(name)
 
     def fullname(self, name: str) -> str:
         return f"{self.prefix}{name}"
 
     def value_for_name(self, name: str) -> Optional[str]:
+        return self.parameters().get(self.fullname(name))
+
+    def parameters(self) -> Dict[str, str]:
+        """All fetched parameters keyed by their full name.
+
+        In path mode this includes every parameter under ``path``, not
+        only the ones declared with ``from_ssm_parameter``, so it can be
+        used for dynamic lookups.
+
+        Once ``ttl`` has passed the cached parameters are still returned
+        and one background thread fetches them again, so readers never
+        wait on the refresh."""
         if self.cache is None:
-            self.cache = self._fetch()
-        return self.cache.get(self.fullname(name))
+            # Keys can be resolved from several threads at once, only
+            # the first one should go and fetch the parameters.
+            with self._lock:
+                if self.cache is None:
+                    METRICS.increment("carlyleconfig_cache_misses_total", cache="ssm")
+                    self._swap(self._fetch())
+        elif self._pending:
+            self._fetch_pending()
+        elif self._expired() and self._refresher is None:
+            stale = self.cache
+            self._refresh_stale()
+            return stale
+        else:
+            METRICS.increment("carlyleconfig_cache_hits_total", cache="ssm")
+        return self.cache or {}
+
+    def version(self) -> int:
+        """Changes whenever the parameters are fetched again.
+
+        Reading it starts a refresh once ``ttl`` has passed, like any
+        other read."""
+        self.parameters()
+        return self._generation
+
+    def invalidate(self) -> None:
+        """Drop the fetched parameters, the next read fetches them again."""
+        with self._lock:
+            self.cache = None
+            self.versions = {}
+
+    def _fetch_pending(self) -> None:
+        with self._lock:
+            names, self._pending = self._pending, []
+            if not names or self.cache is None:
+                return
+            METRICS.increment("carlyleconfig_cache_misses_total", cache="ssm")
+            client = self._client()
+            params = {}
+            for chunk in self._name_chunk(names, self._MAX_SSM_NAMES):
+                result = self._fetch_chunk(client, chunk)
+                params.update({p["Name"]: p for p in result["Parameters"]})
+                self.invalid_parameters.extend(result.get("InvalidParameters", []))
+            self.versions = dict(
+                self.versions,
+                **{n: p["Version"] for n, p in params.items() if "Version" in p},
+            )
+            self.cache = dict(self.cache, **{n: p["Value"] for n, p in params.items()})
+            self._generation += 1
+
+    def subscribe(self, callback: Callable[[Dict[str, Optional[str]]], None]) -> None:
+        """Register a callback to be told about refreshed parameters.
+
+        The callback is called with the full names of the parameters
+        that changed mapped to their new value, or None if they were
+        removed."""
+        self._subscribers.append(callback)
+
+    def refresh(self) -> Dict[str, Optional[str]]:
+        """Fetch the parameters again and swap in the ones that changed.
+
+        Parameters are compared by ``Version`` and only changed entries
+        are replaced. The cache is swapped in one assignment, so readers
+        are never blocked and never see a partial update."""
+        with self._refresh_lock:
+            previous = self.cache or {}
+            previous_versions = self.versions
+            params = self._fetch()
+            changed: Dict[str, Optional[str]] = {}
+            for name, param in params.items():
+                if name not in previous or self._changed(
+                    param, previous[name], previous_versions.get(name)
+                ):
+                    changed[name] = param["Value"]
+            for name in previous:
+                if name not in params:
+                    changed[name] = None
+            self._swap(params)
+        if changed:
+            LOG.debug("Refreshed parameters changed: %s", list(changed))
+            for callback in self._subscribers:
+                callback(changed)
+        return changed
+
+    def start_refresher(self, interval: Optional[float] = None) -> None:
+        """Refresh the parameters from a background daemon thread.
+
+        :param interval: Seconds between refreshes, defaults to ``ttl``.
+        """
+        interval = interval if interval is not None else self.ttl
+        if interval is None:
+            raise ValueError("A refresh interval or ttl is required.")
+        if self._refresher is not None:
+            return
+        self._stop_refresher.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="carlyleconfig-ssm-refresher",
+            daemon=True,
+        )
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        if self._refresher is None:
+            return
+        self._stop_refresher.set()
+        self._refresher.join()
+        self._refresher = None
 
-    def _fetch(self) -> Dict[str, str]:
+    def _refresh_stale(self) -> None:
+        # Only one refresh runs at a time, readers arriving while it is
+        # in flight keep using the cached parameters.
+        if not self._refreshing.acquire(blocking=False):
+            return
+        METRICS.increment("carlyleconfig_cache_expirations_total", cache="ssm")
+
+        def run() -> None:
+            try:
+                self.refresh()
+            except Exception:
+                LOG.debug("Failed to refresh parameters", exc_info=True)
+                # Keep serving the cached parameters for another ttl
+                # instead of starting a refresh on every read.
+                with self._lock:
+                    self._fetched_at = self.clock()
+            finally:
+                self._refreshing.release()
+
+        threading.Thread(
+            target=run, name="carlyleconfig-ssm-refresh", daemon=True
+        ).start()
+
+    def _refresh_loop(self, interval: float) -> None:
+        while not self._stop_refresher.wait(interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the last known values, the next refresh
+                # will try again.
+                LOG.debug("Failed to refresh parameters", exc_info=True)
+
+    def _changed(
+        self, param: Dict[str, Any], value: str, version: Optional[int]
+    ) -> bool:
+        if "Version" in param and version is not None:
+            return bool(param["Version"] != version)
+        return bool(param["Value"] != value)
+
+    def _expired(self) -> bool:
+        if self.ttl is None:
+            return False
+        return self.clock() - self._fetched_at >= self.ttl
+
+    def _swap(self, params: Dict[str, Dict[str, Any]]) -> None:
+        self.versions = {
+            name: param["Version"]
+            for name, param in params.items()
+            if "Version" in param
+        }
+        self._fetched_at = self.clock()
+        self.cache = {name: param["Value"] for name, param in params.items()}
+        self._generation += 1
+
+    def _client(self) -> ParameterFetcher:
         if self.client is None:
             # The package does not depend on boto3, any application that
             # uses the config package to load ssm parameters itself should
@@ -84,17 +316,87 @@ class SSMPlugin(BasePlugin):
             import boto3  # type: ignore
 
             self.client = boto3.client("ssm")  # type: ParameterFetcher
-        values = {}
-        for names in self._name_chunk(self.names, self._MAX_SSM_NAMES):
-            result = self.client.get_parameters(
+        return self.client
+
+    def _fetch(self) -> Dict[str, Dict[str, Any]]:
+        client = self._client()
+        params = {}
+        names = self.names
+        path = self.path
+        if path is not None:
+            params.update(self._fetch_path(cast(ParameterPathFetcher, client), path))
+            # Only names outside of the path still need to be fetched one
+            # by one. Anything inside it that did not come back does not
+            # exist.
+            names = [
+                name for name in names if not self._in_path(self.fullname(name), path)
+            ]
+        chunks = list(self._name_chunk(names, self._MAX_SSM_NAMES))
+        if self.max_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(
+                    executor.map(lambda names: self._fetch_chunk(client, names), chunks)
+                )
+        else:
+            results = [self._fetch_chunk(client, names) for names in chunks]
+        invalid = []
+        for result in results:
+            params.update({param["Name"]: param for param in result["Parameters"]})
+            invalid.extend(result.get("InvalidParameters", []))
+        if invalid:
+            LOG.debug("Invalid parameters: %s", invalid)
+        self.invalid_parameters = invalid
+        return params
+
+    def _fetch_path(
+        self, client: ParameterPathFetcher, path: str
+    ) -> Dict[str, Dict[str, Any]]:
+        params = {}
+        kwargs: Dict[str, Any] = {
+            "Path": path.rstrip("/") or "/",
+            "Recursive": self.recursive,
+            "WithDecryption": True,
+        }
+
+        def fetch() -> Dict[str, Any]:
+            METRICS.increment(
+                "carlyleconfig_remote_calls_total",
+                service="ssm",
+                operation="GetParametersByPath",
+            )
+            return client.get_parameters_by_path(**kwargs)
+
+        while True:
+            result = self.retry.call(fetch)
+            LOG.debug("Fetched by path: %s", result)
+            params.update({param["Name"]: param for param in result["Parameters"]})
+            if not result.get("NextToken"):
+                return params
+            kwargs["NextToken"] = result["NextToken"]
+
+    def _in_path(self, fullname: str, path: str) -> bool:
+        path = path.rstrip("/") + "/"
+        if not fullname.startswith(path):
+            return False
+        return self.recursive or "/" not in fullname[len(path) :]
+
+    def _fetch_chunk(
+        self, client: ParameterFetcher, names: List[str]
+    ) -> Dict[str, Any]:
+        def fetch() -> Dict[str, Any]:
+            METRICS.increment(
+                "carlyleconfig_remote_calls_total",
+                service="ssm",
+                operation="GetParameters",
+            )
+            return client.get_parameters(
                 Names=[self.fullname(name) for name in names],
                 WithDecryption=True,
             )
-            LOG.debug("Fetched: %s", result)
-            values.update(
-                {param["Name"]: param["Value"] for param in result["Parameters"]}
-            )
-        return values
+
+        result = self.retry.call(fetch)
+        LOG.debug("Fetched: %s", result)
+        return result
 
     def _name_chunk(self, names: List[str], n: int) -> Generator[List[str], None, None]:
         for i in range(0, len(names), n):
@@ -0,0 +1,287 @@
+"""Profile how long each key of a config class takes to resolve.
+
+.. code-block::
+
+    python -m carlyleconfig.profile mypkg.settings:Config --stub
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import sys
+import time
+import types
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+
+from carlyleconfig.metrics import METRICS
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass
+class KeyProfile:
+    name: str
+    seconds: float
+    source: Optional[str]
+    tried: int
+    remote_calls: Dict[str, int]
+    providers: Dict[str, float] = field(default_factory=lambda: {})
+
+
+class StubSSMClient:
+    """Offline stand in for a boto3 SSM client.
+
+    Every parameter exists and its value is its own name."""
+
+    def get_parameters(self, Names: List[str], WithDecryption: bool) -> Dict[str, Any]:
+        return {"Parameters": [{"Name": name, "Value": name} for name in Names]}
+
+    def get_parameters_by_path(self, **kwargs: Any) -> Dict[str, Any]:
+        return {"Parameters": []}
+
+
+class StubSecretsManagerClient:
+    """Offline stand in for a boto3 Secrets Manager client.
+
+    Every secret exists and is an empty JSON object."""
+
+    class exceptions:
+        class ResourceNotFoundException(Exception):
+            pass
+
+    def get_secret_value(self, SecretId: str) -> Dict[str, str]:
+        return {"Name": SecretId, "SecretString": "{}"}
+
+
+STUB_CLIENTS = {
+    "ssm": StubSSMClient,
+    "secretsmanager": StubSecretsManagerClient,
+}
+
+
+@contextmanager
+def stub_boto3() -> Iterator[None]:
+    """Replace ``boto3`` with a module creating offline stub clients."""
+    stub = types.ModuleType("boto3")
+
+    def client(service_name: str, *args: Any, **kwargs: Any) -> Any:
+        if service_name not in STUB_CLIENTS:
+            raise ValueError(f"No stub client for {service_name}")
+        return STUB_CLIENTS[service_name]()
+
+    setattr(stub, "client", client)
+    previous = sys.modules.get("boto3")
+    sys.modules["boto3"] = stub
+    try:
+        yield
+    finally:
+        if previous is None:
+            sys.modules.pop("boto3", None)
+        else:
+            sys.modules["boto3"] = previous
+
+
+def load_class(target: str) -> Any:
+    """Import ``module:Class``."""
+    module_name, _, class_name = target.partition(":")
+    if not class_name:
+        raise ValueError(f"Expected module:Class, got '{target}'")
+    cls: Any = importlib.import_module(module_name)
+    for part in class_name.split("."):
+        cls = getattr(cls, part)
+    if not hasattr(cls, "__carlyleconfig_plan__"):
+        raise ValueError(f"{target} is not a carlyleconfig class")
+    return cls
+
+
+def profile(cls: Any, cold: bool = True) -> List[KeyProfile]:
+    """Resolve every key of ``cls`` again, one at a time, with metrics on.
+
+    Keys are resolved in plan order, so the remote calls made while
+    resolving a key, such as the first SSM key fetching every declared
+    parameter, are counted against that key.
+
+    :param cold: Drop the caches of the plugins used by ``cls`` first,
+        so remote calls and their latency are measured instead of being
+        served from values fetched earlier in the process.
+    """
+    fields = cls.__carlyleconfig_fields__
+    plan = cls.__carlyleconfig_plan__
+    if cold:
+        for plugin in _plugins(fields):
+            LOG.debug("Dropping the cache of %s", plugin.name())
+            plugin.invalidate()
+    was_enabled = METRICS.enabled
+    METRICS.enable()
+    try:
+        for key in fields.values():
+            key.invalidate()
+        profiles = []
+        for name in plan.order:
+            key = fields[name]
+            before, before_seconds = _counters(), _seconds()
+            start = time.perf_counter()
+            key.resolve()
+            elapsed = time.perf_counter() - start
+            after = _counters()
+            profiles.append(
+                KeyProfile(
+                    name=name,
+                    seconds=elapsed,
+                    source=key._source,
+                    tried=int(_delta(before, after, name, "provider_calls")),
+                    remote_calls=_remote_delta(before, after),
+                    providers=_provider_seconds(before_seconds, key.name),
+                )
+            )
+        return profiles
+    finally:
+        if not was_enabled:
+            METRICS.disable()
+
+
+def _plugins(fields: Dict[str, Any]) -> List[Any]:
+    plugins: Dict[int, Any] = {}
+    for key in fields.values():
+        for provider in key.providers:
+            plugin = getattr(provider, "plugin", None)
+            if callable(getattr(plugin, "invalidate", None)):
+                plugins.setdefault(id(plugin), plugin)
+    return list(plugins.values())
+
+
+Counters = Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]
+
+
+def _counters() -> Counters:
+    counters = METRICS.to_dict()["counters"]
+    return {
+        (name, tuple(sorted(entry["labels"].items()))): entry["value"]
+        for name, entries in counters.items()
+        for entry in entries
+    }
+
+
+def _delta(before: Counters, after: Counters, key: str, metric: str) -> float:
+    name = f"carlyleconfig_{metric}_total"
+    return sum(
+        value - before.get((series, labels), 0)
+        for (series, labels), value in after.items()
+        if series == name and ("key", key) in labels
+    )
+
+
+def _remote_delta(before: Counters, after: Counters) -> Dict[str, int]:
+    calls: Dict[str, int] = {}
+    for (series, labels), value in after.items():
+        if series != "carlyleconfig_remote_calls_total":
+            continue
+        delta = int(value - before.get((series, labels), 0))
+        if delta:
+            service = dict(labels)["service"]
+            calls[service] = calls.get(service, 0) + delta
+    return calls
+
+
+Seconds = Dict[Tuple[str, str], float]
+
+
+def _seconds() -> Seconds:
+    histograms = METRICS.to_dict()["histograms"]
+    return {
+        (entry["labels"]["key"], entry["labels"]["provider"]): entry["sum"]
+        for entry in histograms.get("carlyleconfig_provider_seconds", [])
+    }
+
+
+def _provider_seconds(before: Seconds, key: str) -> Dict[str, float]:
+    return {
+        provider: seconds - before.get((name, provider), 0.0)
+        for (name, provider), seconds in _seconds().items()
+        if name == key
+    }
+
+
+def format_table(profiles: List[KeyProfile]) -> str:
+    rows = [("key", "ms", "tried", "source", "remote calls")]
+    for p in sorted(profiles, key=lambda p: p.seconds, reverse=True):
+        remote = ", ".join(f"{s}={n}" for s, n in sorted(p.remote_calls.items()))
+        rows.append(
+            (p.name, f"{p.seconds * 1000:.3f}", str(p.tried), p.source or "-", remote)
+        )
+    total_remote: Dict[str, int] = {}
+    for p in profiles:
+        for service, calls in p.remote_calls.items():
+            total_remote[service] = total_remote.get(service, 0) + calls
+    rows.append(
+        (
+            "total",
+            f"{sum(p.seconds for p in profiles) * 1000:.3f}",
+            str(sum(p.tried for p in profiles)),
+            "",
+            ", ".join(f"{s}={n}" for s, n in sorted(total_remote.items())),
+        )
+    )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+def flame(cls: Any, profiles: List[KeyProfile]) -> Dict[str, Any]:
+    """Profiles as a ``{name, value, children}`` tree, values in microseconds."""
+    return {
+        "name": cls.__qualname__,
+        "value": round(sum(p.seconds for p in profiles) * 1e6),
+        "children": [
+            {
+                "name": p.name,
+                "value": round(p.seconds * 1e6),
+                "children": [
+                    {"name": provider, "value": round(seconds * 1e6)}
+                    for provider, seconds in p.providers.items()
+                ],
+            }
+            for p in profiles
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m carlyleconfig.profile",
+        description="Show how long each key of a config class takes to resolve.",
+    )
+    parser.add_argument("target", help="Config class to profile, as module:Class.")
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Replace boto3 clients with offline stubs.",
+    )
+    parser.add_argument("--flame", help="Write a flame graph JSON file to this path.")
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Keep the plugin caches, values fetched earlier are not timed.",
+    )
+    args = parser.parse_args(argv)
+    if args.stub:
+        with stub_boto3():
+            cls = load_class(args.target)
+            profiles = profile(cls, cold=not args.warm)
+    else:
+        cls = load_class(args.target)
+        profiles = profile(cls, cold=not args.warm)
+    print(format_table(profiles))
+    if args.flame:
+        with open(args.flame, "w") as f:
+            json.dump(flame(cls, profiles), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
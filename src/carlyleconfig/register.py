@@ -1,70 +1,402 @@
 import logging
 import pprint
-from typing import Dict, Any, Type, List, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError, dataclass
+from typing import Dict, Any, Type, List, Optional, Callable, Tuple
+
+from carlyleconfig.context import ResolutionContext
+from carlyleconfig.plan import ResolutionPlan, build_plan
+from carlyleconfig.schema import ConfigSchema, build_schema
+from carlyleconfig.snapshot import read_snapshot, write_snapshot
 
 LOG = logging.getLogger(__name__)
 
 
-def init_factory(fields: Dict[str, Any]) -> Callable[[Any], None]:
+@dataclass(frozen=True)
+class Options:
+    """Options passed through ``deriveconfig`` to ``register``."""
+
+    parallel: bool = False
+    workers: Optional[int] = None
+    slots: bool = False
+    frozen: bool = False
+    lazy: bool = False
+
+    @property
+    def concurrent(self) -> bool:
+        return self.parallel or self.workers is not None
+
+
+def init_factory(
+    fields: Dict[str, Any], plan: ResolutionPlan, options: Options = Options()
+) -> Callable[[Any], None]:
     def init(self: Any, **kwargs: Any) -> None:
         LOG.debug("Initializing carlyleconfig class %s", self.__class__.__name__)
-        for name, field in fields.items():
-            LOG.debug("Initializing field: %s", name)
+        only_providers = kwargs.get("__only_providers", [])
+        max_workers = kwargs.get("__workers", options.workers)
+        if options.concurrent or max_workers is not None:
+            values = _resolve_concurrently(
+                fields, plan, kwargs, only_providers, max_workers
+            )
+        else:
+            values = _resolve_sequentially(fields, plan, kwargs, only_providers)
+        # Assign in declaration order regardless of resolution order.
+        for name in plan.fields:
+            object.__setattr__(self, name, values[name])
+        LOG.debug("Done initializing carlyleconfig class %s", self.__class__.__name__)
+
+    return init
+
+
+def generate_init(
+    fields: Dict[str, Any], plan: ResolutionPlan, options: Options = Options()
+) -> Callable[[Any], None]:
+    """Generate an ``__init__`` specialized to the fields of one class.
+
+    The sequential path of ``init_factory`` is unrolled into straight
+    line code the same way ``dataclasses`` builds its ``__init__``, so
+    instantiation does not loop over the fields or go through
+    ``setattr``. Concurrent resolution is delegated to the generic
+    ``init_factory`` version."""
+    index = {name: i for i, name in enumerate(plan.fields)}
+    namespace: Dict[str, Any] = {
+        "LOG": LOG,
+        "__concurrent_init": init_factory(fields, plan, options),
+        "__object_setattr": object.__setattr__,
+    }
+    for name, i in index.items():
+        namespace[f"__key_{i}"] = fields[name]
+    concurrent = "True" if options.concurrent else '"__workers" in kwargs'
+    lines = [
+        "def __init__(self, **kwargs):",
+        f"    if {concurrent}:",
+        "        __concurrent_init(self, **kwargs)",
+        "        return",
+        "    LOG.debug(",
+        '        "Initializing carlyleconfig class %s", self.__class__.__name__',
+        "    )",
+        '    only_providers = kwargs.get("__only_providers", [])',
+    ]
+    for name in plan.order:
+        i = index[name]
+        lines.extend(
+            [
+                f"    if {name!r} in kwargs:",
+                f"        value_{i} = kwargs[{name!r}]",
+                "    else:",
+                f"        value_{i} = __key_{i}.resolve(only_providers)",
+            ]
+        )
+    for name in plan.fields:
+        if options.slots or options.frozen:
+            lines.append(f"    __object_setattr(self, {name!r}, value_{index[name]})")
+        else:
+            lines.append(f"    self.__dict__[{name!r}] = value_{index[name]}")
+    lines.extend(
+        [
+            "    LOG.debug(",
+            '        "Done initializing carlyleconfig class %s", self.__class__.__name__',
+            "    )",
+        ]
+    )
+    exec("\n".join(lines), namespace)
+    init: Callable[[Any], None] = namespace["__init__"]
+    return init
+
+
+_ONLY_PROVIDERS = "__carlyleconfig_only_providers__"
+_WORKERS = "__carlyleconfig_workers__"
+
+
+def lazy_init_factory(
+    fields: Dict[str, Any], plan: ResolutionPlan, options: Options = Options()
+) -> Callable[[Any], None]:
+    def init(self: Any, **kwargs: Any) -> None:
+        LOG.debug("Initializing lazy carlyleconfig class %s", self.__class__.__name__)
+        # Remember how to resolve the fields later, on first access.
+        self.__dict__[_ONLY_PROVIDERS] = kwargs.get("__only_providers", [])
+        self.__dict__[_WORKERS] = kwargs.get("__workers", options.workers)
+        for name in plan.fields:
             if name in kwargs:
                 LOG.debug("Explicit value provided: %s", kwargs[name])
-                value = kwargs[name]
-            else:
-                value = field.resolve(kwargs.get("__only_providers", []))
-            setattr(self, name, value)
-            LOG.debug("Done initializing %s", name)
-        LOG.debug("Done initializing carlyleconfig class %s", self.__class__.__name__)
+                self.__dict__[name] = kwargs[name]
 
     return init
 
 
-def register(Cls: Type[Any]) -> None:
+class LazyField:
+    """Descriptor resolving a field the first time it is read.
+
+    The value is stored in the instance ``__dict__`` under the field
+    name, which takes precedence over this non-data descriptor, so
+    later reads are plain attribute lookups."""
+
+    def __init__(self, name: str, key: Any) -> None:
+        self.name = name
+        self.key = key
+
+    def __get__(self, instance: Any, owner: Optional[Type[Any]] = None) -> Any:
+        if instance is None:
+            return self.key
+        LOG.debug("Lazily initializing field: %s", self.name)
+        value = self.key.resolve(instance.__dict__.get(_ONLY_PROVIDERS, []))
+        instance.__dict__[self.name] = value
+        return value
+
+
+def _resolve_field(
+    name: str, field: Any, kwargs: Dict[str, Any], only_providers: Optional[List[str]]
+) -> Any:
+    LOG.debug("Initializing field: %s", name)
+    if name in kwargs:
+        LOG.debug("Explicit value provided: %s", kwargs[name])
+        value = kwargs[name]
+    else:
+        value = field.resolve(only_providers)
+    LOG.debug("Done initializing %s", name)
+    return value
+
+
+def _resolve_sequentially(
+    fields: Dict[str, Any],
+    plan: ResolutionPlan,
+    kwargs: Dict[str, Any],
+    only_providers: Optional[List[str]],
+) -> Dict[str, Any]:
+    return {
+        name: _resolve_field(name, fields[name], kwargs, only_providers)
+        for name in plan.order
+    }
+
+
+def _resolve_concurrently(
+    fields: Dict[str, Any],
+    plan: ResolutionPlan,
+    kwargs: Dict[str, Any],
+    only_providers: Optional[List[str]],
+    workers: Optional[int],
+) -> Dict[str, Any]:
+    values: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for level in plan.levels:
+            LOG.debug("Resolving concurrently: %s", level)
+            futures = {
+                name: executor.submit(
+                    _resolve_field, name, fields[name], kwargs, only_providers
+                )
+                for name in level
+            }
+            for name, future in futures.items():
+                values[name] = future.result()
+    return values
+
+
+def register(
+    Cls: Type[Any],
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    slots: bool = False,
+    frozen: bool = False,
+    lazy: bool = False,
+) -> Type[Any]:
+    if lazy and slots:
+        raise TypeError("Lazy config classes cannot use slots.")
+    options = Options(
+        parallel=parallel, workers=workers, slots=slots, frozen=frozen, lazy=lazy
+    )
     fields = {k: v for k, v in vars(Cls).items() if not k.startswith("__")}
     _attach_names(fields)
-    _attach_init(Cls, fields)
+    if options.slots:
+        Cls = _add_slots(Cls, fields)
+    plan = _attach_plan(Cls, fields)
+    setattr(Cls, "__carlyleconfig_options__", options)
+    _attach_init(Cls, fields, plan, options)
+    if options.lazy:
+        _attach_lazy_fields(Cls, fields)
     _attach_constructors(Cls)
-    _attach_key_filter(Cls, fields)
+    _attach_snapshot(Cls)
+    _attach_warm(Cls, fields, plan, options)
+    _attach_key_filter(Cls, _attach_schema(Cls, fields, plan))
+    _attach_invalidate(Cls, fields)
     _attach_repr(Cls, fields)
+    _attach_overrides(Cls, plan, options)
+    if options.frozen:
+        _attach_frozen(Cls, plan)
+    return Cls
 
 
 def _attach_names(fields: Dict[str, Any]) -> None:
     for name, field in fields.items():
         field.name = name
+        field.compile()
+
+
+def _attach_plan(Cls: Type[Any], fields: Dict[str, Any]) -> ResolutionPlan:
+    plan = build_plan(fields)
+    setattr(Cls, "__carlyleconfig_plan__", plan)
+    setattr(Cls, "__carlyleconfig_fields__", fields)
+    return plan
 
 
-def _attach_init(Cls: Type[Any], fields: Dict[str, Any]) -> None:
-    setattr(Cls, "__init__", init_factory(fields))
+def _add_slots(Cls: Type[Any], fields: Dict[str, Any]) -> Type[Any]:
+    # __slots__ only takes effect when a class is created, so build a
+    # new class without the ConfigKey members, which would otherwise
+    # conflict with the slot descriptors.
+    namespace = {
+        k: v for k, v in vars(Cls).items() if k not in fields and k != "__dict__"
+    }
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = tuple(fields)
+    metaclass: Any = type(Cls)
+    new_cls: Type[Any] = metaclass(Cls.__name__, Cls.__bases__, namespace)
+    new_cls.__qualname__ = Cls.__qualname__
+    return new_cls
 
 
-def constructor_factory() -> Callable[[Type[Any], Optional[List[str]]], Any]:
-    def load(cls: Type[Any], only_providers: Optional[List[str]] = None) -> Any:
-        return cls(__only_providers=only_providers)
+def _attach_init(
+    Cls: Type[Any],
+    fields: Dict[str, Any],
+    plan: ResolutionPlan,
+    options: Options = Options(),
+) -> None:
+    if options.lazy:
+        init = lazy_init_factory(fields, plan, options)
+    else:
+        init = generate_init(fields, plan, options)
+    init.__qualname__ = f"{Cls.__qualname__}.{init.__name__}"
+    setattr(Cls, "__init__", init)
+
+
+def _attach_lazy_fields(Cls: Type[Any], fields: Dict[str, Any]) -> None:
+    for name, field in fields.items():
+        setattr(Cls, name, LazyField(name, field))
+
+
+def _attach_warm(
+    Cls: Type[Any],
+    fields: Dict[str, Any],
+    plan: ResolutionPlan,
+    options: Options = Options(),
+) -> None:
+    def warm(self: Any, workers: Optional[int] = None) -> Any:
+        """Resolve every field that has not been read yet.
+
+        Only lazy config classes have anything left to resolve, for any
+        other class this does nothing."""
+        if not hasattr(self, "__dict__"):
+            return self
+        pending = [name for name in plan.fields if name not in self.__dict__]
+        if not pending:
+            return self
+        only_providers = self.__dict__.get(_ONLY_PROVIDERS, [])
+        workers = workers if workers is not None else self.__dict__.get(_WORKERS)
+        if options.parallel or workers is not None:
+            subset = {name: fields[name] for name in pending}
+            values = _resolve_concurrently(
+                subset, build_plan(subset), {}, only_providers, workers
+            )
+        else:
+            values = {
+                name: _resolve_field(name, fields[name], {}, only_providers)
+                for name in plan.order
+                if name in pending
+            }
+        for name in pending:
+            self.__dict__[name] = values[name]
+        return self
+
+    setattr(Cls, "warm", warm)
+
+
+def constructor_factory() -> Callable[..., Any]:
+    def load(
+        cls: Type[Any],
+        only_providers: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        context: Optional[ResolutionContext] = None,
+        snapshot: Optional[str] = None,
+        max_age: Optional[float] = None,
+    ) -> Any:
+        kwargs: Dict[str, Any] = {"__only_providers": only_providers}
+        if workers is not None:
+            kwargs["__workers"] = workers
+        stored = None
+        if snapshot is not None:
+            stored = read_snapshot(cls, snapshot, max_age)
+            if stored is not None:
+                LOG.debug("Loading %s from snapshot %s", cls.__name__, snapshot)
+                kwargs.update(stored)
+        if context is not None:
+            kwargs.update(
+                _resolve_in_context(cls, context, only_providers, workers, kwargs)
+            )
+        config = cls(**kwargs)
+        # A filtered load would store a partial config.
+        if snapshot is not None and stored is None and only_providers is None:
+            try:
+                write_snapshot(config, snapshot)
+            except OSError:
+                LOG.debug("Could not write snapshot %s", snapshot, exc_info=True)
+        return config
 
     return load
 
 
+def _resolve_in_context(
+    cls: Type[Any],
+    context: ResolutionContext,
+    only_providers: Optional[List[str]],
+    workers: Optional[int],
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    plan = cls.__carlyleconfig_plan__
+    fields = {
+        name: context.key(field) for name, field in cls.__carlyleconfig_fields__.items()
+    }
+    if workers is not None:
+        return _resolve_concurrently(fields, plan, kwargs, only_providers, workers)
+    return _resolve_sequentially(fields, plan, kwargs, only_providers)
+
+
 def _attach_constructors(Cls: Type[Any]) -> None:
     setattr(Cls, "load", classmethod(constructor_factory()))
 
 
-def _attach_key_filter(Cls: Type[Any], fields: Dict[str, Any]) -> None:
+def _attach_snapshot(Cls: Type[Any]) -> None:
+    def snapshot(self: Any, path: str) -> None:
+        """Write the resolved values to ``path`` for ``load(snapshot=path)``."""
+        write_snapshot(self, path)
+
+    setattr(Cls, "snapshot", snapshot)
+
+
+def _attach_schema(
+    Cls: Type[Any], fields: Dict[str, Any], plan: ResolutionPlan
+) -> ConfigSchema:
+    schema = build_schema(fields, plan)
+    setattr(Cls, "__carlyleconfig_schema__", schema)
+    return schema
+
+
+def _attach_key_filter(Cls: Type[Any], schema: ConfigSchema) -> None:
     def filterfn(cls: Type[Any], has_provider: Optional[List[str]] = None) -> List[str]:
-        if has_provider is None:
-            has_provider = []
-        keys = []
-        for name, field in fields.items():
-            for provider in field.providers:
-                if provider.__class__.__name__ in has_provider:
-                    keys.append(name)
-        return keys
+        return schema.with_provider(has_provider or [])
 
     setattr(Cls, "keys", classmethod(filterfn))
 
 
+def _attach_invalidate(Cls: Type[Any], fields: Dict[str, Any]) -> None:
+    def invalidate(cls: Type[Any], only_providers: Optional[List[str]] = None) -> None:
+        """Forget the cached values of every field.
+
+        With ``only_providers`` only the values memoized for that subset
+        of providers are forgotten."""
+        for field in fields.values():
+            field.invalidate(only_providers)
+
+    setattr(Cls, "invalidate", classmethod(invalidate))
+
+
 def _repr_factory(fields: Dict[str, Any]) -> Callable[[Any], str]:
     def __repr__(self: Any) -> str:
         return pprint.pformat(
@@ -80,3 +412,53 @@ def _repr_factory(fields: Dict[str, Any]) -> Callable[[Any], str]:
 
 def _attach_repr(Cls: Type[Any], fields: Dict[str, Any]) -> None:
     setattr(Cls, "__repr__", _repr_factory(fields))
+
+
+def _values(self: Any, plan: ResolutionPlan) -> Tuple[Any, ...]:
+    return tuple(getattr(self, name) for name in plan.fields)
+
+
+def _attach_overrides(
+    Cls: Type[Any], plan: ResolutionPlan, options: Options = Options()
+) -> None:
+    def with_overrides(self: Any, **kwargs: Any) -> Any:
+        unknown = set(kwargs).difference(plan.fields)
+        if unknown:
+            raise TypeError(
+                f"{self.__class__.__name__} has no fields {sorted(unknown)}"
+            )
+        # Unchanged values are shared with the original instance
+        # instead of being resolved or copied again.
+        copy = self.__class__.__new__(self.__class__)
+        if options.lazy:
+            # Fields that were not read yet stay lazy on the copy.
+            copy.__dict__.update(self.__dict__)
+            copy.__dict__.update(kwargs)
+            return copy
+        for name in plan.fields:
+            value = kwargs[name] if name in kwargs else getattr(self, name)
+            object.__setattr__(copy, name, value)
+        return copy
+
+    setattr(Cls, "with_overrides", with_overrides)
+
+
+def _attach_frozen(Cls: Type[Any], plan: ResolutionPlan) -> None:
+    def __setattr__(self: Any, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self: Any, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self: Any, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return _values(self, plan) == _values(other, plan)
+
+    def __hash__(self: Any) -> int:
+        return hash(_values(self, plan))
+
+    setattr(Cls, "__setattr__", __setattr__)
+    setattr(Cls, "__delattr__", __delattr__)
+    setattr(Cls, "__eq__", __eq__)
+    setattr(Cls, "__hash__", __hash__)
@@ -0,0 +1,106 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+from carlyleconfig.plan import ResolutionPlan
+from carlyleconfig.plugins.base import BasePlugin
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FieldSchema:
+    """What is known about one field of a config class."""
+
+    name: str
+    sensitive: bool
+    provider_types: Tuple[str, ...]
+    plugins: Tuple[str, ...]
+    sources: Tuple[str, ...]
+    remote: bool
+    dependencies: FrozenSet[str]
+    dependents: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class ConfigSchema:
+    """Indexes over the fields of a config class.
+
+    The schema is built once when the class is registered and stored on
+    the class as ``__carlyleconfig_schema__``. Every index maps to field
+    names in declaration order, so queries cost a lookup instead of a
+    scan over every field and provider. Providers added to a key after
+    its class was registered are not indexed."""
+
+    fields: Dict[str, FieldSchema]
+    by_provider_type: Dict[str, Tuple[str, ...]]
+    by_plugin: Dict[str, Tuple[str, ...]]
+    sensitive: Tuple[str, ...]
+    remote: Tuple[str, ...]
+    positions: Dict[str, int]
+
+    def with_provider(self, provider_types: Iterable[str]) -> List[str]:
+        """Fields with a provider of any of ``provider_types``, once each."""
+        return self._union(self.by_provider_type, provider_types)
+
+    def with_plugin(self, plugins: Iterable[str]) -> List[str]:
+        """Fields with a provider from any of ``plugins``, by plugin name."""
+        return self._union(self.by_plugin, plugins)
+
+    def dependencies(self, name: str) -> FrozenSet[str]:
+        return self.fields[name].dependencies
+
+    def dependents(self, name: str) -> FrozenSet[str]:
+        return self.fields[name].dependents
+
+    def _union(
+        self, index: Dict[str, Tuple[str, ...]], keys: Iterable[str]
+    ) -> List[str]:
+        keys = list(keys)
+        if len(keys) == 1:
+            return list(index.get(keys[0], ()))
+        found = {name for key in keys for name in index.get(key, ())}
+        return sorted(found, key=self.positions.__getitem__)
+
+
+def build_schema(fields: Dict[str, Any], plan: ResolutionPlan) -> ConfigSchema:
+    schemas = {}
+    by_provider_type: Dict[str, List[str]] = {}
+    by_plugin: Dict[str, List[str]] = {}
+    for name, key in fields.items():
+        provider_types = _unique(p.__class__.__name__ for p in key.providers)
+        plugins = [
+            p.plugin
+            for p in key.providers
+            if isinstance(getattr(p, "plugin", None), BasePlugin)
+        ]
+        plugin_names = _unique(plugin.name() for plugin in plugins)
+        schemas[name] = FieldSchema(
+            name=name,
+            sensitive=key.sensitive,
+            provider_types=provider_types,
+            plugins=plugin_names,
+            sources=tuple(
+                getattr(p, "description", p.__class__.__name__) for p in key.providers
+            ),
+            remote=any(plugin.remote for plugin in plugins),
+            dependencies=plan.dependencies[name],
+            dependents=plan.dependents[name],
+        )
+        for provider_type in provider_types:
+            by_provider_type.setdefault(provider_type, []).append(name)
+        for plugin_name in plugin_names:
+            by_plugin.setdefault(plugin_name, []).append(name)
+    LOG.debug("Built schema for fields %s", list(schemas))
+    return ConfigSchema(
+        fields=schemas,
+        by_provider_type={k: tuple(v) for k, v in by_provider_type.items()},
+        by_plugin={k: tuple(v) for k, v in by_plugin.items()},
+        sensitive=tuple(name for name, s in schemas.items() if s.sensitive),
+        remote=tuple(name for name, s in schemas.items() if s.remote),
+        positions={name: i for i, name in enumerate(schemas)},
+    )
+
+
+def _unique(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(values))
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+LOG = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+def write_snapshot(config: Any, path: str) -> None:
+    """Write the resolved values of a config instance to ``path``.
+
+    Every value is stored with the description of the provider it came
+    from and the time it was resolved. Values that cannot be stored as
+    JSON are left out and resolved again when the snapshot is loaded.
+
+    The file is written to a temporary file next to ``path`` and moved
+    into place, so readers never see a partial snapshot. It is only
+    readable by its owner when the class has a sensitive field,
+    otherwise its mode follows the process umask."""
+    cls = type(config)
+    fields = cls.__carlyleconfig_fields__
+    now = time.time()
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name, key in fields.items():
+        value = getattr(config, name)
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            LOG.debug("Not storing %s in snapshot, it is not JSON", name)
+            continue
+        entries[name] = {
+            "value": value,
+            "source": key._source,
+            "timestamp": key._resolved_at if key._resolved_at is not None else now,
+        }
+    document = {
+        "version": VERSION,
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "created_at": now,
+        "fields": entries,
+    }
+    sensitive = any(key.sensitive for key in fields.values())
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".carlyleconfig-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            # mkstemp creates the file readable by its owner only.
+            if not sensitive:
+                os.chmod(tmp, 0o666 & ~_umask())
+            json.dump(document, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    LOG.debug("Wrote snapshot of %s to %s", document["class"], path)
+
+
+def _umask() -> int:
+    # The umask can only be read by setting it.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def read_snapshot(
+    cls: Any, path: str, max_age: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Read the values stored by ``write_snapshot``.
+
+    :returns: The stored values by field name, or None if the snapshot
+        does not exist, is malformed, is older than ``max_age`` seconds,
+        or was not written for ``cls``.
+    """
+    try:
+        with open(path) as f:
+            document = json.load(f)
+    except FileNotFoundError:
+        LOG.debug("No snapshot at %s", path)
+        return None
+    except (OSError, ValueError):
+        LOG.debug("Could not read snapshot %s", path, exc_info=True)
+        return None
+    name = f"{cls.__module__}.{cls.__qualname__}"
+    if not isinstance(document, dict):
+        LOG.debug("Snapshot %s is malformed", path)
+        return None
+    if document.get("version") != VERSION or document.get("class") != name:
+        LOG.debug("Snapshot %s was not written for %s", path, name)
+        return None
+    created_at = document.get("created_at")
+    entries = document.get("fields")
+    if (
+        not isinstance(created_at, (int, float))
+        or isinstance(created_at, bool)
+        or not isinstance(entries, dict)
+        or not all(
+            isinstance(entry, dict) and "value" in entry for entry in entries.values()
+        )
+    ):
+        LOG.debug("Snapshot %s is malformed", path)
+        return None
+    age = time.time() - created_at
+    if max_age is not None and age > max_age:
+        LOG.debug("Snapshot %s is stale, %.1fs old", path, age)
+        return None
+    fields = cls.__carlyleconfig_fields__
+    return {name: entry["value"] for name, entry in entries.items() if name in fields}
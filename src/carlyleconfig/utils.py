@@ -1,4 +1,24 @@
-from typing import cast
+import logging
+import mmap
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, TypeVar, cast
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+THROTTLING_ERROR_CODES = frozenset(
+    [
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+    ]
+)
 
 
 class OSUtils:
@@ -6,3 +26,64 @@ class OSUtils:
         mode = "r" if not binary else "rb"
         with open(path, mode=mode) as f:
             return cast(str | bytes, f.read())
+
+    def map_file(self, path: str) -> mmap.mmap | bytes:
+        """Map a file into memory read-only instead of copying it.
+
+        The caller owns the map and must close it. Empty files cannot be
+        mapped, ``b""`` is returned for them."""
+        with open(path, mode="rb") as f:
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return b""
+
+    def stat(self, path: str) -> Optional[Tuple[int, ...]]:
+        """Signature used to tell if a file changed since it was read.
+
+        ``os.stat`` follows symlinks, so swapping a symlink to point at a
+        new file, the way Kubernetes updates ConfigMap volumes, changes
+        the inode even when the size and mtime match."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check if an exception raised by a boto3 client is a throttling error."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    return response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+@dataclass
+class RetryPolicy:
+    """Retry throttled calls with jittered exponential backoff.
+
+    The delay before retry ``n`` is a random value between 0 and
+    ``min(max_delay, base_delay * 2 ** n)``, the "full jitter" strategy,
+    so clients that were throttled together do not retry together."""
+
+    max_attempts: int = 5
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+    sleep: Callable[[float], None] = time.sleep
+    jitter: Callable[[], float] = random.random
+
+    def call(self, fn: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                attempt += 1
+                if attempt >= self.max_attempts or not is_throttling_error(e):
+                    raise
+                delay = self.jitter() * min(
+                    self.max_delay, self.base_delay * 2 ** (attempt - 1)
+                )
+                LOG.debug("Throttled, retrying in %.3fs: %s", delay, e)
+                self.sleep(delay)
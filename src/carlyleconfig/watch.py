@@ -0,0 +1,295 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from carlyleconfig.context import ResolutionContext
+from carlyleconfig.plugins.fileparse import FilePlugin, FileProvider
+
+LOG = logging.getLogger(__name__)
+
+ChangeCallback = Callable[[str, Any, Any], None]
+ReplaceCallback = Callable[[Any, Any], None]
+
+
+@dataclass
+class Watched:
+    """A watched config instance and how it was loaded."""
+
+    config: Any
+    context: Optional[ResolutionContext] = None
+    only_providers: Optional[List[str]] = None
+    explicit: FrozenSet[str] = frozenset()
+
+    def group(self) -> Tuple[type, int, Optional[Tuple[str, ...]]]:
+        only = None if self.only_providers is None else tuple(self.only_providers)
+        return type(self.config), id(self.context), only
+
+    def fields(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = type(self.config).__carlyleconfig_fields__
+        if self.context is None:
+            return fields
+        return {name: self.context.key(key) for name, key in fields.items()}
+
+
+@dataclass
+class FileWatcher:
+    """Push changes of files behind a FilePlugin into config instances.
+
+    Every watched config instance is scanned for keys with a
+    FileProvider from ``plugin``. When one of those files changes on
+    disk only the keys reading it, and the keys depending on them, are
+    resolved again, once per config class and way of loading it. An
+    instance loaded with a ``context`` or ``only_providers`` has to be
+    watched with the same ones. Fields whose value changed
+    are updated in place and every ``on_change`` callback is called with
+    the field name, the old value and the new value.
+
+    Instances of frozen classes are never mutated, their hash depends on
+    their values. A replacement is built with ``with_overrides``, watched
+    instead of the old instance and passed to every ``on_replace``
+    callback along with the old instance.
+
+    Changes are detected by comparing ``os.stat`` signatures. When the
+    optional ``inotify_simple`` package is installed the watcher thread
+    sleeps on inotify events for the watched directories, otherwise it
+    polls every ``interval`` seconds.
+
+    .. code-block::
+
+        watcher = FileWatcher(derive.get_plugin(FilePlugin))
+        watcher.watch(config)
+        watcher.on_change(lambda name, old, new: print(name, old, new))
+        watcher.on_replace(lambda old, new: print(new))
+        watcher.start()
+    """
+
+    plugin: FilePlugin
+    interval: float = 1.0
+    debounce: float = 0.1
+    use_inotify: bool = True
+    _instances: List[Watched] = field(default_factory=lambda: [], repr=False)
+    _callbacks: List[ChangeCallback] = field(default_factory=lambda: [], repr=False)
+    _replace_callbacks: List[ReplaceCallback] = field(
+        default_factory=lambda: [], repr=False
+    )
+    _signatures: Dict[str, Optional[Tuple[int, ...]]] = field(
+        default_factory=lambda: {}, repr=False
+    )
+    _thread: Optional[threading.Thread] = field(default=None, repr=False)
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def watch(
+        self,
+        config: Any,
+        context: Optional[ResolutionContext] = None,
+        only_providers: Optional[List[str]] = None,
+        explicit: Iterable[str] = (),
+    ) -> None:
+        """Start pushing file changes into a config instance.
+
+        :param context: The context the instance was loaded with. Its
+            keys are resolved in that context, so files that are only
+            read in the context, such as per tenant paths, are watched.
+        :param only_providers: The providers the instance was loaded with.
+        :param explicit: Names of fields that were given explicitly, such
+            as values passed to ``with_overrides``. They are never changed.
+        """
+        fields = type(config).__carlyleconfig_fields__
+        unknown = set(explicit).difference(fields)
+        if unknown:
+            raise ValueError(f"{type(config).__name__} has no fields {sorted(unknown)}")
+        watched = Watched(config, context, only_providers, frozenset(explicit))
+        with self._lock:
+            self._instances.append(watched)
+            self._track(watched)
+
+    def unwatch(self, config: Any) -> None:
+        with self._lock:
+            self._instances = [i for i in self._instances if i.config is not config]
+
+    def on_change(self, callback: ChangeCallback) -> ChangeCallback:
+        """Register ``callback(field, old, new)`` to be told about changes."""
+        self._callbacks.append(callback)
+        return callback
+
+    def on_replace(self, callback: ReplaceCallback) -> ReplaceCallback:
+        """Register ``callback(old, new)`` to receive replaced frozen instances."""
+        self._replace_callbacks.append(callback)
+        return callback
+
+    def check(self) -> Set[str]:
+        """Look for changed files and push their changes once.
+
+        Bursts of writes are absorbed by waiting ``debounce`` seconds
+        after the first change is seen and checking again, so a file
+        being rewritten in several steps is only reloaded once.
+
+        :returns: The paths that changed.
+        """
+        changed = self._changed_paths()
+        if not changed:
+            return changed
+        while self.debounce and not self._stop.wait(self.debounce):
+            more = self._changed_paths()
+            if not more:
+                break
+            changed |= more
+        self.reload(changed)
+        return changed
+
+    def reload(self, paths: Set[str]) -> None:
+        """Resolve again every watched key that reads one of ``paths``."""
+        for path in paths:
+            self.plugin.invalidate(path)
+        with self._lock:
+            instances = list(self._instances)
+        resolved: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for watched in instances:
+            group = watched.group()
+            if group not in resolved:
+                resolved[group] = self._resolve(watched, paths)
+            self._reload_instance(watched, resolved[group])
+        with self._lock:
+            # A changed file can point the keys depending on it at
+            # other files.
+            for watched in self._instances:
+                self._track(watched)
+
+    def start(self) -> None:
+        """Watch for changes from a background daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="carlyleconfig-file-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        wait = self._inotify_waiter() if self.use_inotify else None
+        if wait is None:
+            LOG.debug("Polling for file changes every %ss", self.interval)
+            wait = self._stop.wait
+        while not self._stop.is_set():
+            wait(self.interval)
+            if self._stop.is_set():
+                return
+            try:
+                self.check()
+            except Exception:
+                LOG.debug("Failed to reload changed files", exc_info=True)
+
+    def _inotify_waiter(self) -> Optional[Callable[[float], Any]]:
+        try:
+            # Optional dependency, without it the watcher polls.
+            import inotify_simple  # type: ignore
+        except ImportError:
+            return None
+        notify = inotify_simple.INotify()
+        mask = (
+            inotify_simple.flags.CLOSE_WRITE
+            | inotify_simple.flags.MOVED_TO
+            | inotify_simple.flags.CREATE
+            | inotify_simple.flags.DELETE
+            | inotify_simple.flags.ATTRIB
+        )
+        watched: Set[str] = set()
+
+        def wait(timeout: float) -> None:
+            # Watch the directories instead of the files so atomic
+            # renames and symlink swaps are seen as well.
+            with self._lock:
+                directories = {os.path.dirname(p) for p in self._signatures}
+            for directory in directories - watched:
+                if os.path.isdir(directory):
+                    notify.add_watch(directory, mask)
+                    watched.add(directory)
+            notify.read(timeout=int(timeout * 1000))
+
+        LOG.debug("Watching for file changes with inotify")
+        return wait
+
+    def _changed_paths(self) -> Set[str]:
+        changed = set()
+        with self._lock:
+            for path, signature in self._signatures.items():
+                current = self.plugin.osutils.stat(path)
+                if current != signature:
+                    LOG.debug("%s changed on disk", path)
+                    self._signatures[path] = current
+                    changed.add(path)
+        return changed
+
+    def _resolve(self, watched: Watched, paths: Set[str]) -> Dict[str, Any]:
+        fields = watched.fields()
+        plan = type(watched.config).__carlyleconfig_plan__
+        reading = [
+            name
+            for name, key in fields.items()
+            if any(provider.path() in paths for provider in self._providers(key))
+        ]
+        values = {}
+        for name in plan.affected_by(reading):
+            key = fields[name]
+            key.invalidate()
+            values[name] = key.resolve(watched.only_providers)
+        return values
+
+    def _reload_instance(self, watched: Watched, values: Dict[str, Any]) -> None:
+        config = watched.config
+        changes = {}
+        for name, new in values.items():
+            if name in watched.explicit:
+                continue
+            old = getattr(config, name)
+            if new != old:
+                LOG.debug("Field %s changed", name)
+                changes[name] = (old, new)
+        if not changes:
+            return
+        replacement = None
+        if type(config).__carlyleconfig_options__.frozen:
+            replacement = config.with_overrides(
+                **{name: new for name, (_, new) in changes.items()}
+            )
+            with self._lock:
+                watched.config = replacement
+        else:
+            for name, (_, new) in changes.items():
+                object.__setattr__(config, name, new)
+        for name, (old, new) in changes.items():
+            for callback in self._callbacks:
+                callback(name, old, new)
+        if replacement is not None:
+            for replace_callback in self._replace_callbacks:
+                replace_callback(config, replacement)
+
+    def _track(self, watched: Watched) -> None:
+        for path in self._paths(watched):
+            if path not in self._signatures:
+                self._signatures[path] = self.plugin.osutils.stat(path)
+
+    def _paths(self, watched: Watched) -> Set[str]:
+        return {
+            provider.path()
+            for name, key in watched.fields().items()
+            if name not in watched.explicit
+            for provider in self._providers(key)
+        }
+
+    def _providers(self, key: Any) -> List[FileProvider]:
+        return [
+            provider
+            for provider in key.providers
+            if isinstance(provider, FileProvider) and provider.plugin is self.plugin
+        ]
@@ -55,3 +55,133 @@ def test_does_not_log_sensitive_keys(caplog):
     logs = "\n".join(r[2] for r in caplog.record_tuples)
     assert "secret" not in logs
     assert "Providing: *****" in logs
+
+
+def test_providers_share_snapshot(monkeypatch):
+    monkeypatch.setenv("FOO", "bar")
+    plugin = EnvVarPlugin()
+    first, second = ConfigKey(), ConfigKey()
+    plugin.inject_factory_method(first)
+    plugin.inject_factory_method(second)
+    first.from_env_var("FOO")
+    second.from_env_var("BAZ")
+    assert first.providers[0]._environ() is second.providers[0]._environ()
+
+    monkeypatch.setenv("BAZ", "qux")
+    assert first.resolve() == "bar"
+    assert second.resolve() is None
+
+
+def test_refresh_invalidates_changed_keys(monkeypatch):
+    monkeypatch.setenv("FOO", "bar")
+    monkeypatch.setenv("UNCHANGED", "same")
+    plugin = EnvVarPlugin()
+    foo, unchanged = ConfigKey(), ConfigKey()
+    plugin.inject_factory_method(foo)
+    plugin.inject_factory_method(unchanged)
+    foo.from_env_var("FOO")
+    unchanged.from_env_var("UNCHANGED")
+    assert foo.resolve() == "bar"
+    assert unchanged.resolve() == "same"
+    unchanged._cached = "cached"
+
+    monkeypatch.setenv("FOO", "baz")
+    monkeypatch.setenv("UNRELATED", "value")
+    assert plugin.refresh() == {"FOO"}
+    assert foo.resolve() == "baz"
+    assert unchanged.resolve() == "cached"
+
+    monkeypatch.delenv("FOO")
+    assert plugin.refresh() == {"FOO"}
+    assert foo.resolve() is None
+
+
+def prefix_key(plugin, *args, **kwargs):
+    key = ConfigKey()
+    plugin.inject_factory_method(key)
+    return key.from_env_prefix(*args, **kwargs)
+
+
+def test_env_prefix_nests_variables():
+    plugin = EnvVarPlugin(
+        environ={
+            "APP_DEBUG": "1",
+            "APP_DB__HOST": "localhost",
+            "APP_DB__PORT": "5432",
+            "APP_DB__POOL__SIZE": "4",
+            "OTHER_DB__HOST": "remote",
+        }
+    )
+    key = prefix_key(plugin, "APP_")
+    assert key.resolve() == {
+        "debug": "1",
+        "db": {"host": "localhost", "port": "5432", "pool": {"size": "4"}},
+    }
+
+
+def test_env_prefix_options():
+    plugin = EnvVarPlugin(environ={"APP_DB__HOST": "localhost", "APP_DB__PORT": "1"})
+    flat = prefix_key(plugin, "APP_", separator=None)
+    assert flat.resolve() == {"db__host": "localhost", "db__port": "1"}
+    cast = prefix_key(plugin, "APP_DB__", cast=lambda d: (d["host"], int(d["port"])))
+    assert cast.resolve() == ("localhost", 1)
+    assert prefix_key(plugin, "MISSING_").resolve() is None
+
+
+def test_env_prefix_conflict():
+    plugin = EnvVarPlugin(environ={"APP_DB": "x", "APP_DB__HOST": "localhost"})
+    with pytest.raises(ValueError):
+        prefix_key(plugin, "APP_").resolve()
+
+
+def test_env_prefix_scans_once(monkeypatch):
+    plugin = EnvVarPlugin(environ={"A_X": "1", "B_Y": "2"})
+    scans = []
+    scan = plugin._scan
+    monkeypatch.setattr(plugin, "_scan", lambda *a: scans.append(a) or scan(*a))
+    first, second = prefix_key(plugin, "A_"), prefix_key(plugin, "B_")
+    assert first.resolve() == {"x": "1"}
+    assert second.resolve() == {"y": "2"}
+    assert len(scans) == 1
+
+
+def test_env_prefix_refresh(monkeypatch):
+    monkeypatch.setenv("APP_NAME", "first")
+    plugin = EnvVarPlugin()
+    key = prefix_key(plugin, "APP_")
+    assert key.resolve()["name"] == "first"
+    monkeypatch.setenv("APP_NAME", "second")
+    assert plugin.refresh() == {"APP_NAME"}
+    assert key.resolve()["name"] == "second"
+
+
+def test_declaration_snapshot_invalidates_changed_keys(monkeypatch):
+    monkeypatch.setenv("RV_X", "1")
+    plugin = EnvVarPlugin()
+    first = ConfigKey()
+    plugin.inject_factory_method(first)
+    first.from_env_var("RV_X")
+    assert first.resolve() == "1"
+
+    monkeypatch.setenv("RV_X", "2")
+    second = ConfigKey()
+    plugin.inject_factory_method(second)
+    second.from_env_var("RV_Y")
+    assert second.resolve() is None
+    assert first.resolve() == "2"
+    assert plugin.refresh() == set()
+
+
+def test_refresh_keeps_explicit_environ():
+    environ = {"RV_Z": "tenant"}
+    plugin = EnvVarPlugin(environ=environ)
+    key = ConfigKey()
+    plugin.inject_factory_method(key)
+    key.from_env_var("RV_Z")
+    assert key.resolve() == "tenant"
+
+    assert plugin.refresh() == set()
+    assert key.resolve() == "tenant"
+    environ["RV_Z"] = "changed"
+    assert plugin.refresh() == {"RV_Z"}
+    assert key.resolve() == "changed"
@@ -1,3 +1,4 @@
+import mmap
 import os
 import json
 from dataclasses import dataclass, field
@@ -7,8 +8,10 @@ import pytest
 
 from carlyleconfig.plugins import FilePlugin
 from carlyleconfig.plugins.fileparse import FileProvider
-from carlyleconfig.plugins.fileparse import identity
+from carlyleconfig.plugins.fileparse import compile_jmespath, identity
 from carlyleconfig.key import ConfigKey
+from carlyleconfig.parsers import ParserRegistry
+from carlyleconfig.utils import OSUtils
 
 
 def test_plugin_name():
@@ -32,6 +35,9 @@ class FakeOSUtils:
     def read_file(self, *args):
         return self.canned_content
 
+    def stat(self, path):
+        return None
+
 
 @pytest.fixture
 def osutils(request):
@@ -67,10 +73,17 @@ class FakePlugin:
     canned_content: str
     record: List[Tuple[str, Any]] = field(default_factory=lambda: [])
 
-    def read_file(self, path, parser):
+    def read_file(self, path, parser, read_mode="text"):
         self.record.append((path, parser))
         return self.canned_content
 
+    def add_selector(self, *args):
+        pass
+
+    def select(self, path, parser, read_mode, selector):
+        content = self.read_file(path, parser, read_mode)
+        return None if content is None else selector(content)
+
 
 @pytest.fixture
 def plugin(request):
@@ -119,3 +132,259 @@ def test_from_json_file(osutils, jmespath, expected):
     plugin.inject_factory_method(key)
     result = key.from_json_file("test", jmespath=jmespath)
     assert result.resolve() == expected
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@dataclass
+class CountingOSUtils(OSUtils):
+    reads: int = 0
+    stats: int = 0
+
+    def read_file(self, path, binary=False):
+        self.reads += 1
+        return super().read_file(path, binary)
+
+    def stat(self, path):
+        self.stats += 1
+        return super().stat(path)
+
+
+def test_cache_revalidated_after_check_interval(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"value": 1}')
+    clock = FakeClock()
+    osutils = CountingOSUtils()
+    plugin = FilePlugin(osutils=osutils, check_interval=5, clock=clock)
+
+    assert plugin.read_file(str(path), json.loads) == {"value": 1}
+    path.write_text('{"value": 22}')
+    clock.now = 4
+    assert plugin.read_file(str(path), json.loads) == {"value": 1}
+    assert (osutils.reads, osutils.stats) == (1, 1)
+
+    clock.now = 5
+    assert plugin.read_file(str(path), json.loads) == {"value": 22}
+    assert (osutils.reads, osutils.stats) == (2, 2)
+
+    clock.now = 10
+    assert plugin.read_file(str(path), json.loads) == {"value": 22}
+    assert (osutils.reads, osutils.stats) == (2, 3)
+
+
+def test_missing_file_picked_up_once_created(tmp_path):
+    path = tmp_path / "config.json"
+    clock = FakeClock()
+    plugin = FilePlugin(check_interval=1, clock=clock)
+
+    assert plugin.read_file(str(path), json.loads) is None
+    path.write_text('"created"')
+    clock.now = 1
+    assert plugin.read_file(str(path), json.loads) == "created"
+
+
+def test_symlink_swap_detected(tmp_path):
+    # Mimics how Kubernetes updates a ConfigMap volume: the file is a
+    # symlink through ..data, which is atomically pointed at a new
+    # directory holding a file of the same size.
+    for version, value in (("v1", "a"), ("v2", "b")):
+        (tmp_path / version).mkdir()
+        (tmp_path / version / "config").write_text(value)
+    os.symlink("v1", tmp_path / "..data")
+    os.symlink("..data/config", tmp_path / "config")
+    clock = FakeClock()
+    plugin = FilePlugin(check_interval=0, clock=clock)
+    path = str(tmp_path / "config")
+
+    assert plugin.read_file(path, identity) == "a"
+    os.symlink("v2", tmp_path / "..data_tmp")
+    os.replace(tmp_path / "..data_tmp", tmp_path / "..data")
+    assert plugin.read_file(path, identity) == "b"
+
+
+def test_invalidate(tmp_path):
+    path = tmp_path / "config"
+    path.write_text("a")
+    plugin = FilePlugin(check_interval=None)
+
+    assert plugin.read_file(str(path), identity) == "a"
+    path.write_text("b")
+    assert plugin.read_file(str(path), identity) == "a"
+    plugin.invalidate(str(path))
+    assert plugin.read_file(str(path), identity) == "b"
+
+
+@pytest.mark.parametrize(
+    "read_mode,content,expected_type",
+    [
+        ("text", b"data", str),
+        ("binary", b"data", bytes),
+        ("mmap", b"data", mmap.mmap),
+        ("mmap", b"", bytes),
+    ],
+)
+def test_read_modes(tmp_path, read_mode, content, expected_type):
+    path = tmp_path / "file"
+    path.write_bytes(content)
+    seen = []
+
+    def parser(value):
+        seen.append(type(value))
+        return bytes(value[:]) if not isinstance(value, str) else value.encode()
+
+    key = ConfigKey()
+    FilePlugin().inject_factory_method(key)
+    key.from_file(str(path), parser=parser, read_mode=read_mode)
+
+    assert key.resolve() == content
+    assert seen == [expected_type]
+
+
+def test_reload_releases_mapping(tmp_path):
+    path = tmp_path / "file"
+    path.write_bytes(b"first")
+    maps = []
+
+    class RecordingOSUtils(OSUtils):
+        def map_file(self, path):
+            maps.append(super().map_file(path))
+            return maps[-1]
+
+    plugin = FilePlugin(osutils=RecordingOSUtils(), check_interval=0)
+    key = ConfigKey()
+    plugin.inject_factory_method(key)
+    key.from_file(str(path), read_mode="mmap")
+
+    assert key.resolve() == b"first"
+    path.write_bytes(b"second!")
+    key.invalidate()
+    assert key.resolve() == b"second!"
+    assert len(maps) == 2
+    assert all(m.closed for m in maps)
+
+
+def test_invalid_read_mode():
+    key = ConfigKey()
+    FilePlugin().inject_factory_method(key)
+    with pytest.raises(ValueError):
+        key.from_file("file", read_mode="stream")
+
+
+def test_jmespath_compiled_once():
+    assert compile_jmespath("a.b") is compile_jmespath("a.b")
+
+
+def test_selectors_batched_per_document(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"a": 1, "b": {"c": 2}}))
+    calls = []
+
+    def counting(selector):
+        def select(content):
+            calls.append(selector)
+            return selector(content)
+
+        return select
+
+    plugin = FilePlugin(check_interval=0)
+    keys = []
+    for selector in (lambda x: x["a"], lambda x: x["b"]["c"], lambda x: x["d"]):
+        key = ConfigKey()
+        plugin.inject_factory_method(key)
+        keys.append(key.from_file(str(path), json.loads, counting(selector)))
+    same = ConfigKey()
+    plugin.inject_factory_method(same)
+    same.from_json_file(str(path), "b.c")
+    other = ConfigKey()
+    plugin.inject_factory_method(other)
+    other.from_json_file(str(path), "b.c")
+
+    assert keys[0].resolve() == 1
+    # Every selector registered for the file ran in one batch.
+    assert len(calls) == 3
+    assert keys[1].resolve() == 2
+    assert len(calls) == 3
+    # A failing selector is left out of the batch and raises on its own.
+    with pytest.raises(KeyError):
+        keys[2].resolve()
+    assert same.resolve() == other.resolve() == 2
+
+    path.write_text(json.dumps({"a": 10, "b": {"c": 20}}))
+    plugin.invalidate()
+    for key in keys[:2]:
+        key.invalidate()
+    assert [key.resolve() for key in keys[:2]] == [10, 20]
+    assert len(calls) == 7
+
+
+def test_named_parsers(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text("[server]\nport = 8080\n")
+    key = ConfigKey()
+    FilePlugin().inject_factory_method(key)
+    key.from_file(str(path), parser="auto", selector=lambda x: x["server"]["port"])
+    assert key.resolve() == 8080
+
+
+def test_auto_parser_needs_static_filename():
+    key = ConfigKey()
+    FilePlugin().inject_factory_method(key)
+    with pytest.raises(ValueError):
+        key.from_file(ConfigKey(), parser="auto")
+
+
+def test_documents_shared_by_content(tmp_path):
+    parsed = []
+    registry = ParserRegistry()
+    registry.register(
+        "json", lambda content: parsed.append(content) or json.loads(content)
+    )
+    plugin = FilePlugin(parsers=registry, check_interval=0)
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    first.write_text('{"a": 1}')
+    second.write_text('{"a": 1}')
+
+    assert plugin.read_file(str(first), registry.get("json")) == {"a": 1}
+    assert plugin.read_file(str(second), registry.get("json")) == {"a": 1}
+    assert len(parsed) == 1
+
+    first.write_text('{"a": 22}')
+    assert plugin.read_file(str(first), registry.get("json")) == {"a": 22}
+    second.write_text('{"a": 33}')
+    assert plugin.read_file(str(second), registry.get("json")) == {"a": 33}
+    # Documents no longer read through any path are dropped.
+    assert len(plugin._documents) == 2
+
+
+def test_replaced_parser_does_not_reuse_documents(tmp_path):
+    registry = ParserRegistry()
+    old = registry.register("custom", lambda content: "old")
+    plugin = FilePlugin(parsers=registry)
+    path = tmp_path / "file.txt"
+    path.write_text("content")
+
+    assert plugin.read_file(str(path), old) == "old"
+    new = registry.register("custom", lambda content: "new", replace=True)
+    assert new != old
+    assert plugin.read_file(str(path), new) == "new"
+
+
+def test_invalidate_path_keeps_shared_documents(tmp_path):
+    plugin = FilePlugin(check_interval=0)
+    parser = plugin.parsers.get("json")
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    first.write_text('{"a": 1}')
+    second.write_text('{"a": 1}')
+    plugin.read_file(str(first), parser)
+    plugin.read_file(str(second), parser)
+
+    plugin.invalidate(str(first))
+    assert len(plugin._documents) == 1
+    plugin.invalidate(str(second))
+    assert plugin._documents == {} and plugin._document_users == {}
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from carlyleconfig.plugins import SecretsManagerPlugin
@@ -68,3 +70,171 @@ def test_provider(name, key, params, cast, expected):
     config_key.from_secrets_manager(name, **args)
     provider = config_key.providers[0]
     assert provider.provide() == expected
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_secret_fetched_once_for_many_keys(monkeypatch):
+    parsed = []
+    loads = json.loads
+    monkeypatch.setattr(
+        "carlyleconfig.plugins.awssecretsmanager.json.loads",
+        lambda value: parsed.append(value) or loads(value),
+    )
+    client = FakeClient({"SecretString": '{"user": "admin", "password": "hunter2"}'})
+    plugin = SecretsManagerPlugin(client=client)
+    user, password = ConfigKey(), ConfigKey()
+    for key in (user, password):
+        plugin.inject_factory_method(key)
+    user.from_secrets_manager("db", key="user")
+    password.from_secrets_manager("db", key="password")
+
+    assert user.resolve() == "admin"
+    assert password.resolve() == "hunter2"
+    assert client.recorded == ["db"]
+    assert len(parsed) == 1
+
+
+def test_secret_cache_ttl():
+    clock = FakeClock()
+    client = FakeClient({"SecretString": "secret"})
+    plugin = SecretsManagerPlugin(client=client, cache_ttl=10, clock=clock)
+
+    plugin.get_secret("name")
+    clock.now = 9
+    plugin.get_secret("name")
+    assert client.recorded == ["name"]
+    clock.now = 10
+    plugin.get_secret("name")
+    assert client.recorded == ["name", "name"]
+
+
+def test_secret_cache_lru_eviction():
+    client = FakeClient({"SecretString": "secret"})
+    plugin = SecretsManagerPlugin(client=client, cache_size=2)
+
+    for name in ("a", "b", "a", "c", "a", "b"):
+        plugin.get_secret(name)
+    # "b" is evicted when "c" is added since "a" was used more recently.
+    assert client.recorded == ["a", "b", "c", "b"]
+
+
+def test_secret_cache_invalidate():
+    client = FakeClient({"SecretString": "secret"})
+    plugin = SecretsManagerPlugin(client=client)
+
+    plugin.get_secret("name")
+    plugin.invalidate("name")
+    plugin.get_secret("name")
+    plugin.invalidate()
+    plugin.get_secret("name")
+    assert client.recorded == ["name", "name", "name"]
+
+
+class FakeBatchClient(FakeClient):
+    class exceptions:
+        class ResourceNotFoundException(Exception):
+            pass
+
+    def __init__(self, secrets, errors=None):
+        super().__init__(None)
+        self.secrets = secrets
+        self.errors = errors or {}
+        self.batches = []
+
+    def get_secret_value(self, SecretId: str):
+        self.recorded.append(SecretId)
+        if SecretId not in self.secrets:
+            raise self.exceptions.ResourceNotFoundException()
+        return {"Name": SecretId, "SecretString": self.secrets[SecretId]}
+
+    def batch_get_secret_value(self, SecretIdList, NextToken=None):
+        if NextToken is None:
+            self.batches.append(SecretIdList)
+        # Split every response in two pages to exercise NextToken.
+        half = len(SecretIdList) // 2
+        ids = SecretIdList[half:] if NextToken else SecretIdList[:half]
+        result = {
+            "SecretValues": [
+                {"Name": i, "ARN": f"arn:{i}", "SecretString": self.secrets[i]}
+                for i in ids
+                if i in self.secrets
+            ],
+            "Errors": [
+                {
+                    "SecretId": i,
+                    "ErrorCode": self.errors.get(i, "ResourceNotFoundException"),
+                }
+                for i in ids
+                if i not in self.secrets
+            ],
+        }
+        if not NextToken:
+            result["NextToken"] = "next"
+        return result
+
+
+def test_batch_prefetch_registered_secrets():
+    client = FakeBatchClient({"a": "1", "b": "2", "c": "3"})
+    plugin = SecretsManagerPlugin(client=client)
+    keys = []
+    for name in ("a", "b", "c", "missing"):
+        key = ConfigKey()
+        plugin.inject_factory_method(key)
+        keys.append(key.from_secrets_manager(name))
+
+    assert [key.resolve() for key in keys] == ["1", "2", "3", None]
+    assert client.batches == [["a", "b", "c", "missing"]]
+    assert client.recorded == []
+
+
+def test_batch_prefetch_chunks_and_skips_failed_items():
+    secrets = {f"s{i}": str(i) for i in range(25)}
+    client = FakeBatchClient(dict(secrets, denied="x"), errors={"denied": "Denied"})
+    plugin = SecretsManagerPlugin(client=client)
+    del client.secrets["denied"]
+    for name in list(secrets) + ["denied"]:
+        plugin.add_name(name)
+
+    assert plugin.get_secret("s0") == "0"
+    assert [len(batch) for batch in client.batches] == [20, 6]
+    # A prefetched secret that failed is left uncached and does not fail
+    # the secret that was asked for.
+    assert client.recorded == []
+    for name, value in secrets.items():
+        assert plugin.get_secret(name) == value
+    assert len(client.batches) == 2
+    # It is fetched on its own once it is asked for, so its error
+    # surfaces like it does without batching.
+    assert plugin.get_secret("denied") is None
+    assert client.recorded == ["denied"]
+
+
+def test_batch_failure_falls_back_to_requested_secret():
+    class DeniedBatchClient(FakeBatchClient):
+        def batch_get_secret_value(self, **kwargs):
+            raise RuntimeError("AccessDeniedException")
+
+    client = DeniedBatchClient({"mine": "1", "theirs": "2"})
+    plugin = SecretsManagerPlugin(client=client)
+    plugin.add_name("theirs")
+    plugin.add_name("mine")
+
+    assert plugin.get_secret("mine") == "1"
+    assert client.recorded == ["mine"]
+
+
+def test_no_batch_api_fetches_only_requested_secret():
+    client = FakeClient({"SecretString": "secret"})
+    plugin = SecretsManagerPlugin(client=client)
+    for name in ("a", "b", "c"):
+        plugin.add_name(name)
+
+    assert plugin.get_secret("b") == "secret"
+    assert client.recorded == ["b"]
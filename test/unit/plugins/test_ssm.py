@@ -1,10 +1,13 @@
 import string
+import threading
+import time
 
 import pytest
 
 from carlyleconfig.plugins import SSMPlugin
 from carlyleconfig.plugins.ssmplugin import SSMProvider
 from carlyleconfig.key import ConfigKey
+from carlyleconfig.utils import RetryPolicy
 
 
 class FakeClient:
@@ -96,3 +99,306 @@ def test_ssm_api_limit():
     assert len(client.recorded) == 2
     assert len(client.recorded[0]) == 10
     assert len(client.recorded[1]) == 1
+
+
+class ThrottlingError(Exception):
+    def __init__(self):
+        self.response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class SlowClient:
+    def __init__(self, latency=0.05, throttle=0, invalid=()):
+        self.latency = latency
+        self.throttle = throttle
+        self.invalid = invalid
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    def get_parameters(self, Names, WithDecryption):
+        with self.lock:
+            self.calls += 1
+            if self.throttle:
+                self.throttle -= 1
+                raise ThrottlingError()
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.latency)
+        with self.lock:
+            self.active -= 1
+        return {
+            "Parameters": [
+                {"Name": n, "Value": n} for n in Names if n not in self.invalid
+            ],
+            "InvalidParameters": [n for n in Names if n in self.invalid],
+        }
+
+
+def test_ssm_fetches_chunks_concurrently():
+    client = SlowClient()
+    plugin = SSMPlugin("/prefix/", client=client, max_workers=4)
+    for i in range(40):
+        plugin.add_name(f"p{i}")
+
+    assert plugin.value_for_name("p39") == "/prefix/p39"
+    assert client.calls == 4
+    assert client.max_active > 1
+
+
+def test_ssm_retries_throttled_calls():
+    client = SlowClient(latency=0, throttle=2)
+    delays = []
+    plugin = SSMPlugin(
+        client=client,
+        retry=RetryPolicy(sleep=delays.append, jitter=lambda: 1.0, base_delay=0.1),
+    )
+    plugin.add_name("foo")
+
+    assert plugin.value_for_name("foo") == "foo"
+    assert client.calls == 3
+    assert delays == [0.1, 0.2]
+
+
+def test_ssm_gives_up_after_max_attempts():
+    client = SlowClient(latency=0, throttle=5)
+    plugin = SSMPlugin(
+        client=client, retry=RetryPolicy(max_attempts=3, sleep=lambda delay: None)
+    )
+    plugin.add_name("foo")
+
+    with pytest.raises(ThrottlingError):
+        plugin.value_for_name("foo")
+    assert client.calls == 3
+
+
+def test_ssm_reports_invalid_parameters():
+    client = SlowClient(latency=0, invalid=("/prefix/bad",))
+    plugin = SSMPlugin("/prefix/", client=client)
+    plugin.add_name("good")
+    plugin.add_name("bad")
+
+    assert plugin.value_for_name("bad") is None
+    assert plugin.invalid_parameters == ["/prefix/bad"]
+
+
+class FakePathClient(FakeClient):
+    def __init__(self, tree, page_size=2):
+        super().__init__({"Parameters": []})
+        self.tree = tree
+        self.page_size = page_size
+        self.path_calls = []
+
+    def get_parameters(self, Names, WithDecryption):
+        self.recorded.append(Names)
+        return {
+            "Parameters": [
+                {"Name": n, "Value": self.tree[n]} for n in Names if n in self.tree
+            ]
+        }
+
+    def get_parameters_by_path(self, Path, Recursive, WithDecryption, NextToken=None):
+        self.path_calls.append((Path, Recursive, NextToken))
+        names = sorted(
+            n
+            for n in self.tree
+            if n.startswith(Path + "/") and (Recursive or "/" not in n[len(Path) + 1 :])
+        )
+        start = int(NextToken or 0)
+        page = names[start : start + self.page_size]
+        result = {"Parameters": [{"Name": n, "Value": self.tree[n]} for n in page]}
+        if start + self.page_size < len(names):
+            result["NextToken"] = str(start + self.page_size)
+        return result
+
+
+def test_ssm_path_mode():
+    client = FakePathClient(
+        {
+            "/svc/prod/db/host": "db.local",
+            "/svc/prod/db/port": "5432",
+            "/svc/prod/debug": "false",
+            "/svc/prod/extra": "dynamic",
+            "/shared/token": "abc",
+        }
+    )
+    plugin = SSMPlugin(client=client, path="/svc/prod/")
+    for name in ("db/host", "db/port", "debug", "missing"):
+        plugin.add_name(f"/svc/prod/{name}")
+    plugin.add_name("/shared/token")
+
+    assert plugin.value_for_name("/svc/prod/db/host") == "db.local"
+    assert plugin.value_for_name("/svc/prod/debug") == "false"
+    assert plugin.value_for_name("/svc/prod/missing") is None
+    assert plugin.value_for_name("/shared/token") == "abc"
+    assert plugin.parameters()["/svc/prod/extra"] == "dynamic"
+    assert client.path_calls == [
+        ("/svc/prod", True, None),
+        ("/svc/prod", True, "2"),
+    ]
+    # Only the name outside of the path is fetched by name.
+    assert client.recorded == [["/shared/token"]]
+
+
+def test_ssm_path_mode_not_recursive():
+    client = FakePathClient({"/svc/a": "1", "/svc/nested/b": "2"})
+    plugin = SSMPlugin("/svc/", client=client, path="/svc", recursive=False)
+    plugin.add_name("a")
+    plugin.add_name("nested/b")
+
+    assert plugin.value_for_name("a") == "1"
+    assert plugin.value_for_name("nested/b") == "2"
+    assert client.recorded == [["/svc/nested/b"]]
+
+
+class VersionedClient:
+    def __init__(self, params):
+        self.params = params
+        self.calls = 0
+
+    def set(self, name, value, version):
+        self.params[name] = (value, version)
+
+    def get_parameters(self, Names, WithDecryption):
+        self.calls += 1
+        return {
+            "Parameters": [
+                {"Name": n, "Value": self.params[n][0], "Version": self.params[n][1]}
+                for n in Names
+                if n in self.params
+            ]
+        }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ssm_refresh_swaps_changed_versions():
+    client = VersionedClient({"/a": ("1", 1), "/b": ("2", 1), "/c": ("3", 1)})
+    plugin = SSMPlugin(client=client)
+    changes = []
+    plugin.subscribe(changes.append)
+    for name in ("/a", "/b", "/c"):
+        plugin.add_name(name)
+    cache = plugin.parameters()
+
+    client.set("/b", "20", 2)
+    del client.params["/c"]
+    assert plugin.refresh() == {"/b": "20", "/c": None}
+    assert changes == [{"/b": "20", "/c": None}]
+    assert plugin.value_for_name("/b") == "20"
+    assert plugin.versions == {"/a": 1, "/b": 2}
+    # The old cache is replaced, not mutated, so readers holding it are
+    # never left with a half applied update.
+    assert cache == {"/a": "1", "/b": "2", "/c": "3"}
+
+    assert plugin.refresh() == {}
+    assert len(changes) == 1
+
+
+def test_ssm_ttl_refreshes_on_read():
+    clock = FakeClock()
+    client = VersionedClient({"/a": ("1", 1)})
+    plugin = SSMPlugin(client=client, ttl=30, clock=clock)
+    plugin.add_name("/a")
+
+    assert plugin.value_for_name("/a") == "1"
+    client.set("/a", "2", 2)
+    clock.now = 29
+    assert plugin.value_for_name("/a") == "1"
+    refreshed = threading.Event()
+    plugin.subscribe(lambda changed: refreshed.set())
+    clock.now = 30
+    assert plugin.value_for_name("/a") == "1"
+    assert refreshed.wait(timeout=5)
+    assert plugin.value_for_name("/a") == "2"
+    assert client.calls == 2
+
+
+def test_ssm_ttl_refresh_does_not_block_readers():
+    clock = FakeClock()
+    client = VersionedClient({"/a": ("1", 1)})
+    plugin = SSMPlugin(client=client, ttl=30, clock=clock)
+    plugin.add_name("/a")
+    assert plugin.value_for_name("/a") == "1"
+
+    fetching, release = threading.Event(), threading.Event()
+    get_parameters = client.get_parameters
+
+    def slow_get_parameters(**kwargs):
+        fetching.set()
+        assert release.wait(timeout=5)
+        return get_parameters(**kwargs)
+
+    client.get_parameters = slow_get_parameters
+    client.set("/a", "2", 2)
+    refreshed = threading.Event()
+    plugin.subscribe(lambda changed: refreshed.set())
+    clock.now = 30
+    assert plugin.value_for_name("/a") == "1"
+    assert fetching.wait(timeout=5)
+    # The refresh is stuck on the network, readers still get the cached
+    # value straight away and do not start another refresh.
+    assert plugin.value_for_name("/a") == "1"
+    assert plugin.value_for_name("/a") == "1"
+    release.set()
+    assert refreshed.wait(timeout=5)
+    assert plugin.value_for_name("/a") == "2"
+    assert client.calls == 2
+
+
+def test_ssm_failed_ttl_refresh_waits_another_ttl():
+    clock = FakeClock()
+    client = VersionedClient({"/a": ("1", 1)})
+    plugin = SSMPlugin(client=client, ttl=30, clock=clock)
+    plugin.add_name("/a")
+    assert plugin.value_for_name("/a") == "1"
+
+    def failing_get_parameters(**kwargs):
+        client.calls += 1
+        raise RuntimeError("unavailable")
+
+    def wait_for_refresh():
+        for thread in threading.enumerate():
+            if thread.name == "carlyleconfig-ssm-refresh":
+                thread.join(timeout=5)
+
+    client.get_parameters = failing_get_parameters
+    clock.now = 30
+    assert plugin.value_for_name("/a") == "1"
+    wait_for_refresh()
+    for _ in range(100):
+        assert plugin.value_for_name("/a") == "1"
+    wait_for_refresh()
+    assert client.calls == 2
+    clock.now = 60
+    assert plugin.value_for_name("/a") == "1"
+    wait_for_refresh()
+    assert client.calls == 3
+
+
+def test_ssm_background_refresher():
+    client = VersionedClient({"/a": ("1", 1)})
+    plugin = SSMPlugin(client=client)
+    plugin.add_name("/a")
+    plugin.parameters()
+    refreshed = threading.Event()
+    plugin.subscribe(lambda changed: refreshed.set())
+
+    client.set("/a", "2", 2)
+    plugin.start_refresher(interval=0.01)
+    try:
+        assert refreshed.wait(timeout=5)
+    finally:
+        plugin.stop_refresher()
+    assert plugin.value_for_name("/a") == "2"
+
+
+def test_ssm_refresher_requires_interval():
+    with pytest.raises(ValueError):
+        SSMPlugin().start_refresher()
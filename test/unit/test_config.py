@@ -1,5 +1,10 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+
 from carlyleconfig import deriveconfig
 from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plugins import FilePlugin, SSMPlugin
 
 
 def test_repr():
@@ -25,3 +30,248 @@ def test_sensitive_field():
     config = Config()
     value = str(config)
     assert value == "{'secret': '*****'}"
+
+
+class RecordingProvider:
+    def __init__(self, value, record, dependencies=None):
+        self.value = value
+        self.record = record
+        self.dependencies = dependencies or []
+
+    def provide(self):
+        for dependency in self.dependencies:
+            assert dependency._resolved
+        self.record.append(self.value)
+        return self.value
+
+
+def test_parallel_resolve():
+    derive = ConfigEnvironment()
+
+    @deriveconfig(parallel=True, workers=4)
+    class Config:
+        foo: str = derive.field().from_constant("foo")
+        bar: str = derive.field().from_constant("bar")
+        baz: str = derive.field().from_constant(None).from_constant("baz")
+
+    config = Config()
+    assert (config.foo, config.bar, config.baz) == ("foo", "bar", "baz")
+
+
+def test_parallel_resolve_waits_for_dependencies():
+    derive = ConfigEnvironment()
+    record = []
+    first = derive.field()
+    first.providers.append(RecordingProvider("first", record))
+    second = derive.field()
+    second.providers.append(RecordingProvider("second", record, [first]))
+    third = derive.field()
+    third.providers.append(RecordingProvider("third", record, [second]))
+
+    @deriveconfig
+    class Config:
+        third_key = third
+        second_key = second
+        first_key = first
+
+    config = Config.load(workers=3)
+    assert record == ["first", "second", "third"]
+    assert list(vars(config)) == ["third_key", "second_key", "first_key"]
+
+
+def test_explicit_value_overrides_key():
+    derive = ConfigEnvironment()
+
+    @deriveconfig
+    class Config:
+        foo: str = derive.field().from_constant("foo")
+        bar: str = derive.field().from_constant("bar")
+
+    config = Config(foo="override")
+    assert (config.foo, config.bar) == ("override", "bar")
+    assert list(vars(config)) == ["foo", "bar"]
+    assert Config.__init__.__qualname__.endswith("Config.__init__")
+
+
+def test_generated_init_matches_generic_init():
+    from carlyleconfig.register import generate_init, init_factory
+
+    derive = ConfigEnvironment()
+
+    @deriveconfig
+    class Config:
+        path: str = derive.field().from_constant("path")
+        value: str = derive.field().from_constant(None).from_constant("value")
+
+    fields = {name: vars(Config)[name] for name in ("path", "value")}
+    plan = Config.__carlyleconfig_plan__
+    generated, generic = Config.__new__(Config), Config.__new__(Config)
+    generate_init(fields, plan)(generated, value="explicit")
+    init_factory(fields, plan)(generic, value="explicit")
+    assert vars(generated) == vars(generic) == {"path": "path", "value": "explicit"}
+
+
+def test_slots_and_frozen():
+    derive = ConfigEnvironment()
+
+    @deriveconfig(slots=True, frozen=True)
+    class Config:
+        foo: str = derive.field().from_constant("foo")
+        bar: str = derive.field(sensitive=True).from_constant("bar")
+
+    config = Config()
+    assert Config.__slots__ == ("foo", "bar")
+    assert not hasattr(config, "__dict__")
+    assert (config.foo, config.bar) == ("foo", "bar")
+    assert str(config) == "{'bar': '*****', 'foo': 'foo'}"
+    with pytest.raises(FrozenInstanceError):
+        config.foo = "changed"
+    with pytest.raises(FrozenInstanceError):
+        del config.foo
+    assert config == Config()
+    assert hash(config) == hash(Config())
+    assert config != Config(foo="other")
+
+
+def test_with_overrides_shares_values():
+    derive = ConfigEnvironment()
+
+    @deriveconfig(frozen=True)
+    class Config:
+        foo: list = derive.field().from_default_factory(list)
+        bar: str = derive.field().from_constant("bar")
+
+    config = Config()
+    copy = config.with_overrides(bar="baz")
+    assert copy.bar == "baz"
+    assert copy.foo is config.foo
+    assert config.bar == "bar"
+    with pytest.raises(TypeError):
+        config.with_overrides(missing=1)
+
+
+def test_lazy_fields():
+    derive = ConfigEnvironment()
+    record = []
+    foo = derive.field()
+    foo.providers.append(RecordingProvider("foo", record))
+    bar = derive.field()
+    bar.providers.append(RecordingProvider("bar", record))
+
+    @deriveconfig(lazy=True)
+    class Config:
+        foo_key = foo
+        bar_key = bar
+
+    config = Config()
+    assert record == []
+    assert config.bar_key == "bar"
+    assert config.bar_key == "bar"
+    assert record == ["bar"]
+    assert Config.foo_key is foo
+    assert config.warm() is config
+    assert record == ["bar", "foo"]
+    assert str(config) == "{'bar_key': 'bar', 'foo_key': 'foo'}"
+
+
+def test_lazy_overrides_and_warm_concurrently():
+    derive = ConfigEnvironment()
+    record = []
+    foo = derive.field()
+    foo.providers.append(RecordingProvider("foo", record))
+    bar = derive.field()
+    bar.providers.append(RecordingProvider("bar", record, [foo]))
+
+    @deriveconfig(lazy=True, frozen=True)
+    class Config:
+        foo_key = foo
+        bar_key = bar
+
+    assert Config(foo_key="explicit").foo_key == "explicit"
+    config = Config()
+    copy = config.with_overrides(foo_key="copy")
+    assert copy.foo_key == "copy"
+    assert record == []
+    config.warm(workers=2)
+    assert record == ["foo", "bar"]
+    assert (config.foo_key, config.bar_key) == ("foo", "bar")
+    with pytest.raises(FrozenInstanceError):
+        config.foo_key = "changed"
+
+
+def test_lazy_cannot_use_slots():
+    derive = ConfigEnvironment()
+    with pytest.raises(TypeError):
+
+        @deriveconfig(lazy=True, slots=True)
+        class Config:
+            foo: str = derive.field().from_constant("foo")
+
+
+def test_filtered_loads_are_memoized():
+    derive = ConfigEnvironment()
+    record = []
+    foo = derive.field().from_constant("constant")
+    foo.providers.insert(0, RecordingProvider("recorded", record))
+
+    @deriveconfig
+    class Config:
+        foo_key = foo
+
+    for _ in range(3):
+        assert Config.load(only_providers=["RecordingProvider"]).foo_key == "recorded"
+    assert record == ["recorded"]
+    Config.invalidate(["RecordingProvider"])
+    assert Config.load(only_providers=["RecordingProvider"]).foo_key == "recorded"
+    assert record == ["recorded", "recorded"]
+
+
+def test_filtered_loads_follow_plugin_data(tmp_path):
+    path = tmp_path / "name"
+    path.write_text("first")
+    now = [0.0]
+
+    class Client:
+        value = "first"
+
+        def get_parameters(self, Names, WithDecryption):
+            return {"Parameters": [{"Name": n, "Value": self.value} for n in Names]}
+
+    client = Client()
+    derive = ConfigEnvironment()
+    derive.add_plugin(FilePlugin(check_interval=0))
+    ssm = SSMPlugin(client=client, ttl=10, clock=lambda: now[0])
+    derive.add_plugin(ssm)
+
+    @deriveconfig
+    class Config:
+        from_file: str = derive.field().from_file(str(path))
+        from_ssm: str = derive.field().from_ssm_parameter("name")
+
+    only = ["FileProvider", "SSMProvider"]
+    config = Config.load(only_providers=only)
+    assert (config.from_file, config.from_ssm) == ("first", "first")
+
+    path.write_text("second")
+    client.value = "second"
+    ssm.refresh()
+    config = Config.load(only_providers=only)
+    assert (config.from_file, config.from_ssm) == ("second", "second")
+
+
+def test_env_var_set_after_first_declaration(monkeypatch):
+    monkeypatch.delenv("APP_TOKEN", raising=False)
+    derive = ConfigEnvironment()
+
+    @deriveconfig
+    class LibConfig:
+        name: str = derive.field().from_env_var("LIB_NAME").from_constant("lib")
+
+    assert LibConfig().name == "lib"
+    monkeypatch.setenv("APP_TOKEN", "set-later")
+
+    @deriveconfig
+    class AppConfig:
+        token: str = derive.field().from_env_var("APP_TOKEN")
+
+    assert AppConfig().token == "set-later"
@@ -0,0 +1,122 @@
+from carlyleconfig import deriveconfig
+from carlyleconfig.context import ResolutionContext
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plugins import EnvVarPlugin, SSMPlugin
+from carlyleconfig.plugins import FilePlugin
+
+
+class EchoClient:
+    def get_parameters(self, Names, WithDecryption):
+        return {"Parameters": [{"Name": name, "Value": name} for name in Names]}
+
+
+class CountingProvider:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def provide(self):
+        self.calls += 1
+        return self.value
+
+
+def make_config(env_plugin):
+    derive = ConfigEnvironment(plugins={})
+    derive.add_plugin(env_plugin)
+    shared = CountingProvider("shared")
+
+    @deriveconfig
+    class Config:
+        name: str = derive.field().from_env_var("NAME")
+        other = derive.field()
+
+    Config.other.providers.append(shared)
+    return Config, shared
+
+
+def test_context_only_resolves_affected_keys():
+    Config, shared = make_config(EnvVarPlugin(environ={"NAME": "base"}))
+    base = Config.load()
+    context = ResolutionContext([EnvVarPlugin(environ={"NAME": "tenant"})])
+    tenant = Config.load(context=context)
+    again = Config.load(context=context)
+
+    assert (base.name, base.other) == ("base", "shared")
+    assert (tenant.name, tenant.other) == ("tenant", "shared")
+    assert (again.name, again.other) == ("tenant", "shared")
+    assert shared.calls == 1
+    assert Config.load().name == "base"
+    assert context.key(Config.other) is Config.other
+
+
+def test_context_overlay_and_invalidate():
+    Config, _ = make_config(EnvVarPlugin(environ={"NAME": "base"}))
+    tenant_env = EnvVarPlugin(environ={"NAME": "tenant"})
+    context = ResolutionContext([tenant_env])
+    child = context.overlay([])
+    assert Config.load(context=child).name == "tenant"
+
+    tenant_env.environ = {"NAME": "changed"}
+    assert Config.load(context=child).name == "tenant"
+    context.invalidate()
+    assert Config.load(context=child, workers=2).name == "changed"
+    assert Config.load().name == "base"
+
+
+def test_context_replaces_plugin_and_dependent_keys(tmp_path):
+    (tmp_path / "base").write_text("base file")
+    (tmp_path / "tenant").write_text("tenant file")
+    derive = ConfigEnvironment(plugins={})
+    derive.add_plugin(EnvVarPlugin(environ={"DIR": str(tmp_path / "base")}))
+    derive.add_plugin(SSMPlugin(prefix="/base/", client=EchoClient()))
+    derive.add_plugin(FilePlugin())
+
+    @deriveconfig
+    class Config:
+        path: str = derive.field().from_env_var("DIR")
+        content: str = derive.field().from_file(path)
+        param: str = derive.field().from_ssm_parameter("value")
+
+    base = Config.load()
+    context = ResolutionContext(
+        [
+            SSMPlugin(prefix="/tenant/", client=EchoClient()),
+            EnvVarPlugin(environ={"DIR": str(tmp_path / "tenant")}),
+        ]
+    )
+    tenant = Config.load(context=context)
+    assert (base.content, base.param) == ("base file", "/base/value")
+    assert (tenant.content, tenant.param) == ("tenant file", "/tenant/value")
+    assert Config.load().content == "base file"
+
+
+def test_refresh_invalidates_context_keys(monkeypatch):
+    monkeypatch.setenv("NAME", "first")
+    Config, _ = make_config(EnvVarPlugin(environ={"NAME": "base"}))
+    tenant_env = EnvVarPlugin()
+    context = ResolutionContext([tenant_env])
+    assert Config.load(context=context).name == "first"
+
+    monkeypatch.setenv("NAME", "second")
+    assert Config.load(context=context).name == "first"
+    assert tenant_env.refresh() == {"NAME"}
+    assert Config.load(context=context).name == "second"
+    assert Config.load().name == "base"
+
+
+def test_context_shared_between_classes():
+    derive = ConfigEnvironment(plugins={})
+    derive.add_plugin(SSMPlugin(prefix="/base/", client=EchoClient()))
+
+    @deriveconfig
+    class Db:
+        host: str = derive.field().from_ssm_parameter("db/host")
+
+    @deriveconfig
+    class Cache:
+        url: str = derive.field().from_ssm_parameter("cache/url")
+
+    tenant = ResolutionContext([SSMPlugin(prefix="/tenant-b/", client=EchoClient())])
+    assert Db.load(context=tenant).host == "/tenant-b/db/host"
+    assert Cache.load(context=tenant).url == "/tenant-b/cache/url"
+    assert Cache.load().url == "/base/cache/url"
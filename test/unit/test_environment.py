@@ -14,6 +14,7 @@ def test_default_environment():
     assert from_methods == {
         "from_constant",
         "from_env_var",
+        "from_env_prefix",
         "from_argparse",
         "from_file",
         "from_json_file",
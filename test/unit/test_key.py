@@ -50,3 +50,66 @@ def test_does_not_log_sensitive_keys(providers, caplog):
     logs = "\n".join(r[2] for r in caplog.record_tuples)
     assert "secret" not in logs
     assert "test resolved to *****"
+
+
+class OtherProvider(Provider):
+    pass
+
+
+def test_only_providers_uses_compiled_chain():
+    first, second = Provider(None), OtherProvider("other")
+    key = ConfigKey(providers=[first, second, Provider("last")])
+    key.compile()
+    assert key.resolve(["Provider"]) == "last"
+    assert key.resolve(["OtherProvider"]) == "other"
+    assert key.resolve(["Missing"]) is None
+    assert [link[2] for link in key.chain(["OtherProvider"])] == [second]
+    assert key.chain(["OtherProvider"]) is key.chain(["OtherProvider"])
+    assert key.resolve([]) == "other"
+
+
+def test_chain_follows_added_providers():
+    key = ConfigKey(providers=[Provider(None)])
+    key.compile()
+    key.providers.append(Provider("added"))
+    assert key.resolve() == "added"
+
+
+def test_skips_debug_formatting_when_not_debug(caplog):
+    class Value:
+        def __repr__(self):
+            raise AssertionError("formatted")
+
+    caplog.set_level(logging.INFO)
+    assert isinstance(ConfigKey(providers=[Provider(Value())]).resolve(), Value)
+
+
+class CountingProvider(Provider):
+    def __init__(self, value):
+        super().__init__(value)
+        self.calls = 0
+
+    def provide(self):
+        self.calls += 1
+        return self.value
+
+
+def test_only_providers_results_are_memoized():
+    counting = CountingProvider("counted")
+    key = ConfigKey(providers=[Provider(None), counting])
+    assert key.resolve(["CountingProvider"]) == "counted"
+    assert key.resolve(["CountingProvider", "Missing"]) == "counted"
+    assert counting.calls == 1
+
+    key.invalidate(["CountingProvider"])
+    assert key.resolve(["CountingProvider"]) == "counted"
+    assert counting.calls == 2
+    key.invalidate()
+    counting.value = "changed"
+    assert key.resolve(["CountingProvider"]) == "changed"
+    assert counting.calls == 3
+
+    counting.value = "full"
+    assert key.resolve([]) == "full"
+    assert key.resolve(["CountingProvider"]) == "full"
+    assert counting.calls == 5
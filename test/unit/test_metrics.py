@@ -0,0 +1,126 @@
+import pytest
+
+from carlyleconfig import deriveconfig
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.metrics import METRICS, MetricsRegistry
+from carlyleconfig.plugins import SecretsManagerPlugin, SSMPlugin
+
+
+class SecretsClient:
+    class exceptions:
+        class ResourceNotFoundException(Exception):
+            pass
+
+    def get_secret_value(self, SecretId):
+        return {"Name": SecretId, "SecretString": "value"}
+
+
+@pytest.fixture
+def metrics():
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.disable()
+    METRICS.reset()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    registry.increment("calls_total", key="foo")
+    registry.observe("seconds", 0.1, key="foo")
+    assert registry.to_dict() == {"counters": {}, "histograms": {}}
+    assert registry.to_prometheus() == ""
+
+
+def test_resolve_metrics(metrics, tmp_path):
+    (tmp_path / "value").write_text("file")
+    derive = ConfigEnvironment()
+
+    @deriveconfig
+    class Config:
+        foo: str = derive.field().from_constant(None).from_constant("foo")
+        bar: str = derive.field().from_file(str(tmp_path / "value"))
+
+    Config()
+    Config.load()
+    Config.load()
+
+    assert metrics.counter("carlyleconfig_key_resolves_total", key="foo") == 1
+    assert metrics.counter("carlyleconfig_key_cache_hits_total", key="foo") == 2
+    assert (
+        metrics.counter(
+            "carlyleconfig_provider_calls_total", key="foo", provider="ConstantProvider"
+        )
+        == 2
+    )
+    assert metrics.counter("carlyleconfig_cache_misses_total", cache="file") == 1
+    histograms = metrics.to_dict()["histograms"]
+    (histogram,) = [
+        h
+        for h in histograms["carlyleconfig_key_resolve_seconds"]
+        if h["labels"] == {"key": "foo"}
+    ]
+    assert histogram["count"] == 1
+    assert histogram["buckets"]["+Inf"] == 1
+
+
+def test_remote_call_metrics(metrics):
+    class Client:
+        def get_parameters(self, Names, WithDecryption):
+            return {"Parameters": [{"Name": n, "Value": n} for n in Names]}
+
+    plugin = SSMPlugin(client=Client())
+    for i in range(15):
+        plugin.add_name(f"name{i}")
+    plugin.value_for_name("name0")
+    plugin.value_for_name("name1")
+    assert (
+        metrics.counter(
+            "carlyleconfig_remote_calls_total", service="ssm", operation="GetParameters"
+        )
+        == 2
+    )
+    assert metrics.counter("carlyleconfig_cache_hits_total", cache="ssm") == 1
+
+
+def test_expiry_is_not_counted_as_eviction(metrics):
+    class Client:
+        def get_parameters(self, Names, WithDecryption):
+            return {"Parameters": [{"Name": n, "Value": n} for n in Names]}
+
+    now = [0.0]
+    ssm = SSMPlugin(client=Client(), ttl=10, clock=lambda: now[0])
+    ssm.add_name("name")
+    secrets = SecretsManagerPlugin(
+        client=SecretsClient(), cache_ttl=10, clock=lambda: now[0]
+    )
+    secrets.add_name("secret")
+    ssm.value_for_name("name")
+    secrets.get_secret("secret")
+    now[0] = 10
+    ssm.value_for_name("name")
+    secrets.get_secret("secret")
+
+    for cache in ("ssm", "secrets"):
+        assert (
+            metrics.counter("carlyleconfig_cache_expirations_total", cache=cache) == 1
+        )
+        assert metrics.counter("carlyleconfig_cache_evictions_total", cache=cache) == 0
+
+
+def test_prometheus_format():
+    registry = MetricsRegistry(enabled=True, buckets=(0.1, 1.0))
+    registry.increment("calls_total", key='a"b')
+    registry.increment("calls_total", 2, key='a"b')
+    registry.observe("seconds", 0.5)
+    registry.observe("seconds", 2)
+    assert registry.to_prometheus() == (
+        "# TYPE calls_total counter\n"
+        'calls_total{key="a\\"b"} 3\n'
+        "# TYPE seconds histogram\n"
+        'seconds_bucket{le="0.1"} 0\n'
+        'seconds_bucket{le="1"} 1\n'
+        'seconds_bucket{le="+Inf"} 2\n'
+        "seconds_sum 2.5\n"
+        "seconds_count 2\n"
+    )
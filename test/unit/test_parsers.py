@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from carlyleconfig.parsers import PARSERS, ParserRegistry
+
+
+@pytest.mark.parametrize(
+    "name,content,expected",
+    [
+        ("json", '{"a": {"b": 1}}', {"a": {"b": 1}}),
+        ("json", b'{"a": 1}', {"a": 1}),
+        ("toml", "[a]\nb = 1\n", {"a": {"b": 1}}),
+        ("toml", b'a = "x"\n', {"a": "x"}),
+        ("ini", "[a]\nb = 1\n", {"a": {"b": "1"}}),
+        ("yaml", "a:\n  b: 1\n", {"a": {"b": 1}}),
+    ],
+)
+def test_builtin_parsers(name, content, expected):
+    if name == "yaml":
+        pytest.importorskip("yaml")
+    assert PARSERS.get(name)(content) == expected
+
+
+@pytest.mark.parametrize(
+    "path,name",
+    [
+        ("config.json", "json"),
+        ("config.TOML", "toml"),
+        ("setup.cfg", "ini"),
+        ("config.ini", "ini"),
+        ("config.yml", "yaml"),
+        ("config.yaml", "yaml"),
+    ],
+)
+def test_parser_for_path(path, name):
+    assert PARSERS.lookup("auto", path).name == name
+
+
+def test_register_parser():
+    registry = ParserRegistry()
+    parser = registry.register("custom", json.loads, (".custom",))
+    assert registry.get("custom") is parser
+    assert registry.for_path("file.custom") is parser
+    with pytest.raises(ValueError):
+        registry.register("custom", json.loads)
+    registry.register("custom", str.upper, replace=True)
+    assert registry.get("custom")("a") == "A"
+
+
+def test_orjson_is_opt_in():
+    assert PARSERS.lookup("auto", "config.json").name == "json"
+    pytest.importorskip("orjson")
+    assert PARSERS.get("orjson")(b'{"a": 1}') == {"a": 1}
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError):
+        PARSERS.get("missing")
+    with pytest.raises(ValueError):
+        PARSERS.for_path("file.unknown")
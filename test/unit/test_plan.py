@@ -0,0 +1,71 @@
+import pytest
+
+from carlyleconfig import deriveconfig
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.key import ConfigKey
+from carlyleconfig.plan import DependencyCycleError, build_plan
+
+
+class DependentProvider:
+    def __init__(self, *dependencies):
+        self.dependencies = list(dependencies)
+
+    def provide(self):
+        return None
+
+
+def key(*dependencies):
+    return ConfigKey(providers=[DependentProvider(*dependencies)])
+
+
+def test_plan_orders_dependencies_first():
+    base = key()
+    middle = key(base)
+    top = key(middle)
+    plan = build_plan({"top": top, "middle": middle, "base": base})
+    assert plan.fields == ("top", "middle", "base")
+    assert plan.order == ("base", "middle", "top")
+    assert plan.levels == (("base",), ("middle",), ("top",))
+
+
+def test_plan_groups_independent_keys():
+    base = key()
+    plan = build_plan({"a": key(base), "b": key(), "base": base, "c": key(base)})
+    assert plan.levels == (("b", "base"), ("a", "c"))
+
+
+def test_plan_follows_keys_outside_the_class():
+    base = key()
+    external = key(base)
+    plan = build_plan({"top": key(external), "base": base})
+    assert plan.dependencies["top"] == {"base"}
+
+
+def test_plan_requires_and_affected_by():
+    base = key()
+    middle = key(base)
+    plan = build_plan({"top": key(middle), "middle": middle, "base": base, "x": key()})
+    assert plan.requires(["middle"]) == ("base", "middle")
+    assert plan.affected_by(["middle"]) == ("middle", "top")
+    assert plan.affected_by(["x"]) == ("x",)
+
+
+def test_plan_rejects_cycles():
+    first = ConfigKey()
+    second = key(first)
+    first.providers.append(DependentProvider(second))
+    with pytest.raises(DependencyCycleError) as e:
+        build_plan({"first": first, "second": second})
+    assert e.value.cycle == ["first", "second", "first"]
+
+
+def test_plan_stored_on_class():
+    derive = ConfigEnvironment()
+
+    @deriveconfig
+    class Config:
+        path: str = derive.field().from_constant("config.json")
+        value: str = derive.field().from_json_file(path, "value")
+
+    plan = Config.__carlyleconfig_plan__
+    assert plan.dependencies == {"path": set(), "value": {"path"}}
@@ -0,0 +1,89 @@
+import json
+import sys
+import textwrap
+
+import pytest
+
+from carlyleconfig.metrics import METRICS
+from carlyleconfig.profile import main
+
+
+SETTINGS = """
+from carlyleconfig import deriveconfig
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plugins import SSMPlugin
+
+derive = ConfigEnvironment()
+derive.add_plugin(SSMPlugin("/app/"))
+
+
+@deriveconfig
+class Config:
+    name: str = derive.field().from_ssm_parameter("name")
+    other: str = derive.field().from_ssm_parameter("other")
+    default: str = derive.field().from_env_var("PROFILE_UNSET").from_constant("x")
+"""
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    (tmp_path / "profiled_settings.py").write_text(textwrap.dedent(SETTINGS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "profiled_settings:Config"
+    sys.modules.pop("profiled_settings", None)
+
+
+def test_profile_table(settings, capsys, tmp_path):
+    flame_path = tmp_path / "flame.json"
+    assert main([settings, "--stub", "--flame", str(flame_path)]) == 0
+    assert "boto3" not in sys.modules or sys.modules["boto3"].__name__ == "boto3"
+    assert not METRICS.enabled
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["key", "ms", "tried", "source", "remote", "calls"]
+    rows = {line.split()[0]: line for line in lines[1:]}
+    assert "AWS SSM Parameter /app/name" in rows["name"]
+    assert rows["name"].endswith("ssm=1")
+    assert not rows["other"].endswith("ssm=1")
+    assert rows["default"].split()[2] == "2"
+    assert rows["total"].endswith("ssm=1")
+
+    flame = json.loads(flame_path.read_text())
+    assert flame["name"] == "Config"
+    assert [child["name"] for child in flame["children"]] == [
+        "name",
+        "other",
+        "default",
+    ]
+    assert {c["name"] for c in flame["children"][2]["children"]} == {
+        "EnvVarProvider",
+        "ConstantProvider",
+    }
+
+
+def test_profile_rejects_other_targets():
+    with pytest.raises(ValueError):
+        main(["carlyleconfig"])
+    with pytest.raises(ValueError):
+        main(["carlyleconfig:ConfigEnvironment"])
+
+
+def test_profile_keeps_metrics_and_cold_starts(settings):
+    from carlyleconfig.profile import load_class, profile, stub_boto3
+
+    METRICS.enable()
+    try:
+        with stub_boto3():
+            Config = load_class(settings)
+            Config()
+            METRICS.increment("carlyleconfig_test_total")
+            profiles = {p.name: p for p in profile(Config)}
+            warm = {p.name: p for p in profile(Config, cold=False)}
+        assert METRICS.enabled
+        assert METRICS.counter("carlyleconfig_test_total") == 1
+    finally:
+        METRICS.disable()
+        METRICS.reset()
+    assert profiles["name"].remote_calls == {"ssm": 1}
+    assert warm["name"].remote_calls == {}
+    assert warm["default"].providers.keys() == {"EnvVarProvider", "ConstantProvider"}
@@ -0,0 +1,49 @@
+from carlyleconfig import deriveconfig
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plugins import SSMPlugin
+
+
+def make_config():
+    derive = ConfigEnvironment()
+    derive.add_plugin(SSMPlugin("/prefix/"))
+
+    @deriveconfig
+    class Config:
+        path: str = derive.field().from_env_var("PATH_A").from_env_var("PATH_B")
+        content: str = derive.field().from_file(path).from_constant("default")
+        token: str = derive.field(sensitive=True).from_ssm_parameter("token")
+        name: str = derive.field().from_constant("name")
+
+    return Config
+
+
+def test_schema_indexes():
+    Config = make_config()
+    schema = Config.__carlyleconfig_schema__
+    assert schema.by_provider_type["ConstantProvider"] == ("content", "name")
+    assert schema.by_plugin["FilePlugin"] == ("content",)
+    assert schema.sensitive == ("token",)
+    assert schema.remote == ("token",)
+    assert schema.dependencies("content") == {"path"}
+    assert schema.dependents("path") == {"content"}
+
+    field = schema.fields["path"]
+    assert field.provider_types == ("EnvVarProvider",)
+    assert field.plugins == ("EnvVarPlugin",)
+    assert field.sources == (
+        "environment variable PATH_A",
+        "environment variable PATH_B",
+    )
+    assert not field.remote
+
+
+def test_keys_are_unique_and_ordered():
+    Config = make_config()
+    assert Config.keys() == []
+    assert Config.keys(has_provider=["EnvVarProvider"]) == ["path"]
+    assert Config.keys(has_provider=["SSMProvider", "EnvVarProvider"]) == [
+        "path",
+        "token",
+    ]
+    schema = Config.__carlyleconfig_schema__
+    assert schema.with_plugin(["SSMPlugin", "FilePlugin"]) == ["content", "token"]
@@ -0,0 +1,133 @@
+import json
+import os
+import stat
+import time
+
+from carlyleconfig import deriveconfig
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.snapshot import read_snapshot
+
+
+class CountingProvider:
+    description = "counting provider"
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def provide(self):
+        self.calls += 1
+        return self.value
+
+
+def make_config(sensitive=False):
+    derive = ConfigEnvironment()
+    remote = CountingProvider("remote")
+
+    @deriveconfig
+    class Config:
+        name: str = derive.field().from_constant("name")
+        secret = derive.field(sensitive=sensitive)
+        unstored: object = derive.field().from_default_factory(object)
+
+    Config.secret.providers.append(remote)
+    return Config, remote
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "config.json")
+    Config, remote = make_config()
+    Config().snapshot(path)
+    with open(path) as f:
+        document = json.load(f)
+    assert set(document["fields"]) == {"name", "secret"}
+    assert document["fields"]["secret"]["source"] == "counting provider"
+    assert document["fields"]["secret"]["timestamp"] <= time.time()
+    umask = os.umask(0)
+    os.umask(umask)
+    assert mode(path) == 0o666 & ~umask
+
+    config = Config.load(snapshot=path, max_age=60)
+    assert (config.name, config.secret) == ("name", "remote")
+    assert isinstance(config.unstored, object)
+    assert remote.calls == 1
+
+
+def test_snapshot_written_when_missing_or_stale(tmp_path):
+    path = str(tmp_path / "config.json")
+    Config, remote = make_config(sensitive=True)
+    assert Config.load(snapshot=path).secret == "remote"
+    assert mode(path) == 0o600
+    assert Config.load(snapshot=path).secret == "remote"
+    assert remote.calls == 1
+
+    with open(path) as f:
+        document = json.load(f)
+    document["created_at"] -= 120
+    with open(path, "w") as f:
+        json.dump(document, f)
+    Config.load(snapshot=path, max_age=60)
+    with open(path) as f:
+        assert json.load(f)["created_at"] > document["created_at"] + 60
+    assert os.listdir(tmp_path) == ["config.json"]
+
+
+def test_snapshot_of_other_class_is_ignored(tmp_path):
+    path = str(tmp_path / "config.json")
+    Config, _ = make_config()
+    Other, remote = make_config()
+    Other.__qualname__ = "Other"
+    Config().snapshot(path)
+    Other.load(snapshot=path)
+    assert remote.calls == 1
+    (tmp_path / "config.json").write_text("not json")
+    assert Config.load(snapshot=path).name == "name"
+
+
+def test_malformed_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "config.json"
+    Config, _ = make_config()
+    Config().snapshot(str(path))
+    document = json.loads(path.read_text())
+    malformed = [
+        [],
+        "snapshot",
+        {k: v for k, v in document.items() if k != "created_at"},
+        dict(document, created_at="yesterday"),
+        {k: v for k, v in document.items() if k != "fields"},
+        dict(document, fields=[]),
+        dict(document, fields={"name": "name"}),
+    ]
+    for content in malformed:
+        path.write_text(json.dumps(content))
+        assert read_snapshot(Config, str(path)) is None
+        assert Config.load(snapshot=str(path)).name == "name"
+
+
+def test_snapshot_mode_follows_umask(tmp_path):
+    path = str(tmp_path / "config.json")
+    Config, _ = make_config()
+    umask = os.umask(0o077)
+    try:
+        Config().snapshot(path)
+    finally:
+        os.umask(umask)
+    assert mode(path) == 0o600
+
+
+def test_failed_snapshot_write_does_not_fail_load(tmp_path):
+    path = str(tmp_path / "missing" / "config.json")
+    Config, _ = make_config()
+    assert Config.load(snapshot=path).secret == "remote"
+    assert not os.path.exists(path)
+
+
+def test_filtered_load_does_not_write_snapshot(tmp_path):
+    path = str(tmp_path / "config.json")
+    Config, _ = make_config()
+    Config.load(only_providers=["ConstantProvider"], snapshot=path)
+    assert not os.path.exists(path)
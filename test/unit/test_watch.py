@@ -0,0 +1,157 @@
+import json
+import threading
+
+from carlyleconfig import deriveconfig
+from carlyleconfig.context import ResolutionContext
+from carlyleconfig.environment import ConfigEnvironment
+from carlyleconfig.plugins import ConstantPlugin, EnvVarPlugin, FilePlugin
+from carlyleconfig.watch import FileWatcher
+
+
+def make_config(path, frozen=False):
+    plugin = FilePlugin(check_interval=None)
+    derive = ConfigEnvironment(plugins={})
+    derive.add_plugin(plugin)
+    derive.add_plugin(ConstantPlugin())
+
+    @deriveconfig(frozen=frozen)
+    class Config:
+        debug: bool = derive.field().from_json_file(str(path), "debug")
+        name: str = derive.field().from_json_file(str(path), "name")
+        other: str = derive.field().from_constant("other")
+
+    return plugin, Config
+
+
+def test_check_pushes_changed_fields(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"debug": False, "name": "a"}))
+    plugin, Config = make_config(path)
+    config = Config.load()
+    watcher = FileWatcher(plugin, debounce=0)
+    changes = []
+    watcher.on_change(lambda *change: changes.append(change))
+    watcher.watch(config)
+
+    assert watcher.check() == set()
+    path.write_text(json.dumps({"debug": True, "name": "a", "unused": 1}))
+    assert watcher.check() == {str(path)}
+    assert changes == [("debug", False, True)]
+    assert (config.debug, config.name, config.other) == (True, "a", "other")
+
+
+def test_frozen_instances_are_replaced(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"debug": False, "name": "a"}))
+    plugin, Config = make_config(path, frozen=True)
+    config = Config.load()
+    before = hash(config)
+    watcher = FileWatcher(plugin, debounce=0)
+    changes, replaced = [], []
+    watcher.on_change(lambda *change: changes.append(change))
+    watcher.on_replace(lambda old, new: replaced.append((old, new)))
+    watcher.watch(config)
+
+    path.write_text(json.dumps({"debug": True, "name": "a"}))
+    watcher.check()
+    assert changes == [("debug", False, True)]
+    assert config.debug is False and hash(config) == before
+    [(old, new)] = replaced
+    assert old is config
+    assert (new.debug, new.name, new.other) == (True, "a", "other")
+
+    path.write_text(json.dumps({"debug": True, "name": "b"}))
+    watcher.check()
+    assert replaced[-1][0] is new and replaced[-1][1].name == "b"
+
+
+def test_keys_resolve_once_per_class(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"debug": False, "name": "a"}))
+    plugin, Config = make_config(path)
+    first, second = Config.load(), Config.load()
+    watcher = FileWatcher(plugin, debounce=0)
+    watcher.watch(first)
+    watcher.watch(second)
+    key = Config.__carlyleconfig_fields__["debug"]
+    calls = []
+    resolve = key.resolve
+    key.resolve = lambda *a: calls.append(a) or resolve(*a)
+
+    path.write_text(json.dumps({"debug": True, "name": "a"}))
+    watcher.check()
+    assert len(calls) == 1
+    assert first.debug is True and second.debug is True
+
+
+def test_unwatch(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"debug": False}))
+    plugin, Config = make_config(path)
+    config = Config.load()
+    watcher = FileWatcher(plugin, debounce=0)
+    watcher.watch(config)
+    watcher.unwatch(config)
+
+    path.write_text(json.dumps({"debug": True}))
+    watcher.check()
+    assert config.debug is False
+
+
+def test_background_watcher(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"debug": False}))
+    plugin, Config = make_config(path)
+    config = Config.load()
+    watcher = FileWatcher(plugin, interval=0.01, debounce=0.01, use_inotify=False)
+    changed = threading.Event()
+    watcher.on_change(lambda *change: changed.set())
+    watcher.watch(config)
+
+    watcher.start()
+    try:
+        path.write_text(json.dumps({"debug": True}))
+        assert changed.wait(timeout=5)
+    finally:
+        watcher.stop()
+    assert config.debug is True
+
+
+def test_explicit_fields_are_kept(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"debug": False, "name": "a"}))
+    plugin, Config = make_config(path)
+    config = Config.load().with_overrides(name="override")
+    watcher = FileWatcher(plugin, debounce=0)
+    watcher.watch(config, explicit=["name"])
+
+    path.write_text(json.dumps({"debug": True, "name": "b"}))
+    watcher.check()
+    assert (config.debug, config.name) == (True, "override")
+
+
+def test_context_instances_watch_their_own_files(tmp_path):
+    default, tenant = tmp_path / "default.json", tmp_path / "tenant.json"
+    default.write_text(json.dumps({"name": "default"}))
+    tenant.write_text(json.dumps({"name": "tenant"}))
+    plugin = FilePlugin(check_interval=None)
+    derive = ConfigEnvironment(plugins={})
+    derive.add_plugin(plugin)
+    derive.add_plugin(EnvVarPlugin(environ={"CONFIG_PATH": str(default)}))
+
+    @deriveconfig
+    class Config:
+        path: str = derive.field().from_env_var("CONFIG_PATH")
+        name: str = derive.field().from_json_file(
+            derive.field().from_env_var("CONFIG_PATH"), "name"
+        )
+
+    context = ResolutionContext([EnvVarPlugin(environ={"CONFIG_PATH": str(tenant)})])
+    shared, tenant_config = Config.load(), Config.load(context=context)
+    watcher = FileWatcher(plugin, debounce=0)
+    watcher.watch(shared)
+    watcher.watch(tenant_config, context=context)
+
+    tenant.write_text(json.dumps({"name": "changed"}))
+    assert watcher.check() == {str(tenant)}
+    assert (shared.name, tenant_config.name) == ("default", "changed")